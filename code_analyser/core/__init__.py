@@ -1 +1,3 @@
-from .engine import AnalyserEngine
+from .engine import AnalyserEngine, AnalyserResult, IncrementalResult, ProjectReport
+from .profiling import FileProfile, OutlierReport, OutlierTracker
+from .budget import AnalysisBudget
@@ -0,0 +1,72 @@
+import itertools
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    from code_analyser.core.engine import AnalyserResult
+
+
+@dataclass
+class AnalysisBudget:
+    """Violation budget for gating checks.
+
+    Analysis stops as soon as any limit is exceeded, since the outcome is already decided.
+
+    Attributes:
+        max_unused (Optional[int]): Maximum number of unused variables and functions combined, or None for no limit
+        max_brace_violations (Optional[int]): Maximum number of brace violations, or None for no limit
+        must_pass (Sequence[Union[str, Path]]): Files that must analyse without errors or findings. They are analysed first.
+    """
+    max_unused: Optional[int] = None
+    max_brace_violations: Optional[int] = None
+    must_pass: Sequence[Union[str, Path]] = ()
+
+    def order(self, filepaths: Iterable[Union[str, Path]]) -> Iterator[Union[str, Path]]:
+        """Put the must-pass files first (whether or not they are in `filepaths`), then the remaining files in order"""
+        must_pass = [os.fspath(p) for p in self.must_pass]
+        seen = {os.path.normpath(p) for p in must_pass}
+        rest = (p for p in filepaths if os.path.normpath(os.fspath(p)) not in seen)
+        return itertools.chain(must_pass, rest)
+
+    def checker(self) -> 'BudgetChecker':
+        return BudgetChecker(self)
+
+
+class BudgetChecker:
+    """Running totals against an AnalysisBudget"""
+
+    def __init__(self, budget: AnalysisBudget) -> None:
+        self.budget = budget
+        self.unused = 0
+        self.brace_violations = 0
+        self._must_pass = {os.path.normpath(os.fspath(p)) for p in budget.must_pass}
+
+    def add(self, path: str, result: Optional['AnalyserResult'], error: Optional[str] = None) -> Optional[str]:
+        """Account for one file
+
+        Args:
+            path (str): Path of the analysed file
+            result (Optional[AnalyserResult]): Its result, or None if it could not be analysed
+            error (Optional[str], optional): The error, if it could not be analysed. Defaults to None.
+
+        Returns:
+            Optional[str]: Why the budget is exceeded, or None if it is not
+        """
+        must_pass = os.path.normpath(path) in self._must_pass
+        if result is None:
+            return f"Must-pass file {path} could not be analysed: {error}" if must_pass else None
+
+        unused = len(result.unused_report.unused_variables) + len(result.unused_report.unused_functions)
+        brace_violations = len(result.brace_report.violations) if result.brace_report else 0
+        self.unused += unused
+        self.brace_violations += brace_violations
+
+        if must_pass and (unused or brace_violations):
+            return f"Must-pass file {path} has {unused} unused symbols and {brace_violations} brace violations"
+        if self.budget.max_unused is not None and self.unused > self.budget.max_unused:
+            return f"Unused symbols exceed budget: {self.unused} > {self.budget.max_unused}"
+        if self.budget.max_brace_violations is not None and self.brace_violations > self.budget.max_brace_violations:
+            return f"Brace violations exceed budget: {self.brace_violations} > {self.budget.max_brace_violations}"
+        return None
@@ -0,0 +1,163 @@
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Collection, Iterator, List, Optional, Pattern, Tuple, Union
+
+
+# directories that hold vendored, generated or tool files rather than project sources:
+DEFAULT_EXCLUDED_DIRS = frozenset({
+    '.git', '.hg', '.svn',
+    'node_modules', 'bower_components',
+    'build', 'dist', 'target', 'out',
+    '.venv', 'venv', '__pycache__', '.tox', '.nox', '.mypy_cache', '.pytest_cache', '.ruff_cache',
+})
+
+
+@dataclass
+class IgnoreRule:
+    pattern: Pattern[str]
+    negated: bool
+    dir_only: bool
+    anchored: bool
+
+    def matches(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        # patterns without a slash match the name at any depth:
+        return self.pattern.fullmatch(rel_path if self.anchored else name) is not None
+
+
+def _translate(glob: str) -> str:
+    out = []
+    i = 0
+    n = len(glob)
+    while i < n:
+        c = glob[i]
+        if c == '*':
+            if glob.startswith('**/', i):
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if glob.startswith('**', i):
+                out.append('.*')
+                i += 2
+                continue
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            end = glob.find(']', i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append(f'[{body}]')
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(glob[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+def parse_gitignore(text: str) -> List[IgnoreRule]:
+    """Parse the patterns of a .gitignore file
+
+    Supports comments, negation (!), directory-only patterns (trailing /), anchoring (a leading or
+    inner /), and the *, **, ? and [...] wildcards.
+
+    Args:
+        text (str): Contents of the .gitignore file
+
+    Returns:
+        List[IgnoreRule]: Rules in file order (later rules take precedence)
+    """
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        elif line.startswith('\\'):
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        anchored = '/' in line
+        line = line.lstrip('/')
+        rules.append(IgnoreRule(re.compile(_translate(line)), negated, dir_only, anchored))
+    return rules
+
+
+def _is_ignored(ignores: Tuple[Tuple[str, List[IgnoreRule]], ...], rel_path: str, name: str, is_dir: bool) -> bool:
+    # the last matching rule wins, and deeper .gitignore files are consulted last:
+    ignored = False
+    for base, rules in ignores:
+        path_from_base = rel_path[len(base):]
+        for rule in rules:
+            if rule.matches(path_from_base, name, is_dir):
+                ignored = not rule.negated
+    return ignored
+
+
+def discover_sources(root: Union[str, Path], extensions: Optional[Collection[str]] = None, exclude_dirs: Collection[str] = DEFAULT_EXCLUDED_DIRS, use_gitignore: bool = True) -> Iterator[str]:
+    """Find source files below a directory, yielding each path as soon as it is found
+
+    Excluded and ignored directories are pruned without being descended into. Files are filtered by
+    name only, so no file is stat-ed. Symlinked directories are not followed.
+
+    Args:
+        root (Union[str, Path]): Directory to search
+        extensions (Optional[Collection[str]], optional): File extensions to yield (e.g. LANGUAGE_MAP). Defaults to all registered extensions.
+        exclude_dirs (Collection[str], optional): Directory names to skip anywhere in the tree. Defaults to DEFAULT_EXCLUDED_DIRS.
+        use_gitignore (bool, optional): Whether to honour .gitignore files in the tree. Defaults to True.
+
+    Yields:
+        str: Paths of matching source files, in sorted order within each directory
+    """
+    if extensions is None:
+        from code_analyser.core.engine import LANGUAGE_MAP
+        extensions = LANGUAGE_MAP
+    extensions = frozenset(extensions)
+    exclude_dirs = frozenset(exclude_dirs)
+
+    # (directory path, its path relative to root with a trailing '/', active .gitignore rules):
+    stack = [(os.fspath(root), '', ())]
+    while stack:
+        dir_path, rel_dir, ignores = stack.pop()
+        if use_gitignore:
+            try:
+                with open(os.path.join(dir_path, '.gitignore'), 'r', encoding='utf-8') as f:
+                    rules = parse_gitignore(f.read())
+                if rules:
+                    ignores = ignores + ((rel_dir, rules),)
+            except (FileNotFoundError, NotADirectoryError, IsADirectoryError, PermissionError, UnicodeDecodeError):
+                pass
+
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            continue
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if name in exclude_dirs or (ignores and _is_ignored(ignores, rel_dir + name, name, True)):
+                    continue
+                subdirs.append((entry.path, rel_dir + name + '/', ignores))
+            elif os.path.splitext(name)[1] in extensions:
+                if ignores and _is_ignored(ignores, rel_dir + name, name, False):
+                    continue
+                yield entry.path
+        # reversed, so that directories are popped (and files yielded) in sorted order:
+        stack.extend(reversed(subdirs))
@@ -1,18 +1,40 @@
+import cProfile
+import hashlib
 import os
-from typing import Union, Optional, Dict, Type
+import time
+from typing import Any, Collection, Union, Optional, Dict, Type, Iterable, Iterator, Tuple
+from code_analyser.core.budget import AnalysisBudget
+from code_analyser.core.discovery import DEFAULT_EXCLUDED_DIRS, discover_sources
+from code_analyser.core.profiling import FileProfile, OutlierTracker
 from code_analyser.languages.base import LanguageAnalyser
+from code_analyser.languages.brace_family import BraceFamilyAnalyser
 from code_analyser.utils.brace import BraceConfig, BraceReport
 from code_analyser.utils.identifiers import Identifiers
 from code_analyser.utils.unused import UnusedReport
-from code_analyser.languages.python import PythonAnalyser
+from code_analyser.languages.python import DefinitionSummary, PythonAnalyser
 from code_analyser.languages.java import JavaAnalyser
+from code_analyser.languages.c import CAnalyser
+from code_analyser.languages.cpp import CppAnalyser
+from code_analyser.languages.javascript import JavaScriptAnalyser
+from code_analyser.languages.csharp import CSharpAnalyser
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 LANGUAGE_MAP = {
     ".py": PythonAnalyser,
-    ".java": JavaAnalyser
+    ".java": JavaAnalyser,
+    ".c": CAnalyser,
+    ".h": CAnalyser,
+    ".cpp": CppAnalyser,
+    ".cc": CppAnalyser,
+    ".cxx": CppAnalyser,
+    ".hpp": CppAnalyser,
+    ".hh": CppAnalyser,
+    ".js": JavaScriptAnalyser,
+    ".mjs": JavaScriptAnalyser,
+    ".cjs": JavaScriptAnalyser,
+    ".cs": CSharpAnalyser,
 }
 
 
@@ -22,6 +44,71 @@ class AnalyserResult:
     brace_report: Optional[BraceReport]
     comment_count: int
     unused_report: UnusedReport
+    # size of the source in bytes and its number of lines, -1 if unknown:
+    size: int = -1
+    lines: int = -1
+
+
+def _line_count(source: str) -> int:
+    return source.count('\n') + (1 if source and not source.endswith('\n') else 0)
+
+
+def _decode_source(data: bytes) -> str:
+    # decode as text mode would, translating newlines:
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+@dataclass
+class IncrementalResult:
+    """Result of an incremental analysis.
+
+    Attributes:
+        result (AnalyserResult): Analysis of the whole current source
+        segments (Dict[str, DefinitionSummary]): Per-definition summaries keyed by definition text, reused by the next call
+        reanalysed (int): Number of definitions that had to be analysed (rather than reused) for this result
+    """
+    result: AnalyserResult
+    segments: Dict[str, DefinitionSummary]
+    reanalysed: int
+
+
+@dataclass
+class ProjectReport:
+    """Results of analysing a batch of files, keyed by path.
+
+    Files that could not be analysed (unreadable, unsupported or unparsable) are recorded in `errors`
+    instead of aborting the whole batch. If the batch was stopped early because an AnalysisBudget was
+    exceeded, `budget_exceeded` says why and the report only covers the files analysed up to that point.
+    """
+    results: Dict[str, AnalyserResult] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    budget_exceeded: Optional[str] = None
+
+    def add(self, path: str, result: Optional[AnalyserResult], error: Optional[str] = None) -> None:
+        if result is not None:
+            self.results[path] = result
+        else:
+            self.errors[path] = error or 'unknown error'
+
+    @property
+    def file_count(self) -> int:
+        return len(self.results)
+
+    @property
+    def comment_count(self) -> int:
+        return sum(r.comment_count for r in self.results.values())
+
+    @property
+    def unused_variable_count(self) -> int:
+        return sum(len(r.unused_report.unused_variables) for r in self.results.values())
+
+    @property
+    def unused_function_count(self) -> int:
+        return sum(len(r.unused_report.unused_functions) for r in self.results.values())
+
+    @property
+    def brace_violation_count(self) -> int:
+        return sum(len(r.brace_report.violations) for r in self.results.values() if r.brace_report)
 
 
 class AnalyserEngine:
@@ -30,36 +117,232 @@ class AnalyserEngine:
     def __init__(self) -> None:
         self.language_map = LANGUAGE_MAP
 
-    def analyse_file(self, filepath: Union[str, Path], brace_config: Optional[BraceConfig] = None) -> AnalyserResult:
+    def analyse_file(self, filepath: Union[str, Path], brace_config: Optional[BraceConfig] = None, tracker: Optional[OutlierTracker] = None) -> AnalyserResult:
         """Analyse a source file and return an AnalyserResult
 
         Args:
             filepath (Union[str, Path]): Path to the source file
             brace_config (Optional[BraceConfig], optional): Optional brace style config. Defaults to None.
+            tracker (Optional[OutlierTracker], optional): Records per-phase timings and AST shape for the file. Defaults to None.
 
         Returns:
             AnalyserResult: Contains identifiers, brace report, comment count, and unused attributes report
         """
         path_str = os.fspath(filepath)
-        file_ext = os.path.splitext(path_str)[1]
-        AnalyserClass = self.language_map.get(file_ext)
-        if not AnalyserClass:
-            raise ValueError(f"No analyser for extension: {file_ext}")
+        AnalyserClass = self._analyser_class(path_str)
 
+        start = time.perf_counter()
         with open(path_str, 'r', encoding='utf-8') as f:
             source = f.read()
+            size = os.fstat(f.fileno()).st_size
+        read_time = time.perf_counter() - start
+        return self._analyse_read_source(path_str, AnalyserClass, source, size, read_time, brace_config, tracker)
 
+    def _analyse_read_source(self, path_str: str, AnalyserClass: Type[LanguageAnalyser], source: str, size: int, read_time: float, brace_config: Optional[BraceConfig], tracker: Optional[OutlierTracker]) -> AnalyserResult:
         analyser = AnalyserClass()
+        lines = _line_count(source)
+        if tracker is None:
+            result = self._analyse_source(analyser, source, brace_config)[0]
+            result.size, result.lines = size, lines
+            return result
+
+        timings = {'read': read_time}
+        result, ast = self._analyse_source(analyser, source, brace_config, timings)
+        result.size, result.lines = size, lines
+        node_count, max_depth = analyser.ast_stats(ast)
+        profile = FileProfile(
+            path_str,
+            size,
+            lines,
+            timings,
+            node_count,
+            max_depth
+        )
+        if tracker.should_profile(profile):
+            profile.profile_path = tracker.profile_path_for(path_str)
+            profiler = cProfile.Profile()
+            profiler.runcall(self._analyse_source, AnalyserClass(), source, brace_config)
+            profiler.dump_stats(profile.profile_path)
+        tracker.record(profile)
+        return result
+
+    def analyse_incremental(self, filepath: Union[str, Path], source: str, previous: Optional[IncrementalResult] = None, brace_config: Optional[BraceConfig] = None) -> IncrementalResult:
+        """Analyse an edited source buffer, reusing the analysis of top-level definitions whose text is unchanged
+
+        Only Python supports incremental analysis; other languages are re-analysed in full.
+
+        Args:
+            filepath (Union[str, Path]): Path of the file being edited (used to pick the language, it is not read)
+            source (str): The current source code
+            previous (Optional[IncrementalResult], optional): Result for an earlier version of the same file. Defaults to None.
+            brace_config (Optional[BraceConfig], optional): Optional brace style config. Defaults to None.
+
+        Returns:
+            IncrementalResult: The result for the current source, plus state to pass in on the next edit
+        """
+        analyser = self._analyser_class(os.fspath(filepath))()
+        if isinstance(analyser, PythonAnalyser):
+            fields, segments, reanalysed = analyser.analyse_incremental(
+                source, previous.segments if previous else {}, brace_config)
+            incremental = IncrementalResult(AnalyserResult(*fields), segments, reanalysed)
+        else:
+            incremental = IncrementalResult(self._analyse_source(analyser, source, brace_config)[0], {}, 1)
+        # the buffer is not read from disk, so its size is that of its UTF-8 encoding:
+        incremental.result.size = len(source.encode('utf-8'))
+        incremental.result.lines = _line_count(source)
+        return incremental
+
+    def _analyser_class(self, path_str: str) -> Type[LanguageAnalyser]:
+        file_ext = os.path.splitext(path_str)[1]
+        AnalyserClass = self.language_map.get(file_ext)
+        if not AnalyserClass:
+            raise ValueError(f"No analyser for extension: {file_ext}")
+        return AnalyserClass
+
+    def _analyse_source(self, analyser: LanguageAnalyser, source: str, brace_config: Optional[BraceConfig], timings: Optional[Dict[str, float]] = None) -> Tuple[AnalyserResult, Any]:
+        clock = time.perf_counter
+        lex_time = 0.0
+        if timings is not None and isinstance(analyser, BraceFamilyAnalyser):
+            # the scan is cached and reused by the later phases, so time it on its own rather than charging it to
+            #  whichever phase happens to run first:
+            start = clock()
+            analyser.scan(source)
+            lex_time = clock() - start
+        t0 = clock()
         ast = analyser.parse(source)
+        t1 = clock()
         identifiers = analyser.get_identifiers(ast)
+        t2 = clock()
         brace_report = analyser.check_brace_style(
             source, brace_config) if brace_config else None
+        t3 = clock()
         comment_count = analyser.count_comments(ast, source)
+        t4 = clock()
         unused_report = analyser.find_unused(ast)
+        t5 = clock()
+        if timings is not None:
+            timings.update(lex=lex_time, parse=t1 - t0, identifiers=t2 - t1, braces=t3 - t2, comments=t4 - t3, unused=t5 - t4)
 
         return AnalyserResult(
             identifiers,
             brace_report,
             comment_count,
             unused_report
-        )
+        ), ast
+
+    def iter_analyse(self, filepaths: Iterable[Union[str, Path]], brace_config: Optional[BraceConfig] = None, tracker: Optional[OutlierTracker] = None, deduplicate: bool = False, workers: int = 0, batch_size: int = 64) -> Iterator[Tuple[str, Optional[AnalyserResult], Optional[str]]]:
+        """Analyse each file in turn, yielding results as they finish
+
+        Args:
+            filepaths (Iterable[Union[str, Path]]): Paths to the source files
+            brace_config (Optional[BraceConfig], optional): Optional brace style config. Defaults to None.
+            tracker (Optional[OutlierTracker], optional): Collects the slowest and largest files of the batch. Defaults to None.
+            deduplicate (bool, optional): Hash file contents and analyse byte-identical files only once (with workers,
+                once per worker process; hashing happens in the workers). Duplicates are yielded with the same
+                AnalyserResult object as the first copy; the tracker keeps a copy of the first file's profile for them
+                (see OutlierTracker.record_duplicate). Defaults to False.
+            workers (int, optional): Number of worker processes, or 0 to analyse in this process. With workers, files are
+                sent out in batches, each batch's results come back as one message and are yielded in completion order.
+                Defaults to 0.
+            batch_size (int, optional): Number of files per worker batch. Defaults to 64.
+
+        Yields:
+            Tuple[str, Optional[AnalyserResult], Optional[str]]: (path, result, error), where exactly one of result and error is None
+        """
+        if workers:
+            if tracker is not None:
+                raise ValueError("Outlier tracking is not supported with worker processes")
+            from code_analyser.core.parallel import iter_analyse_parallel
+            yield from iter_analyse_parallel(self, filepaths, brace_config, workers, batch_size, deduplicate)
+            return
+
+        # (analyser class, content digest) -> (result, error, path) of the first file with that content:
+        seen: Optional[Dict[Tuple[Type[LanguageAnalyser], bytes], Tuple[Optional[AnalyserResult], Optional[str], str]]] = {} if deduplicate else None
+        for filepath in filepaths:
+            path_str = os.fspath(filepath)
+            if seen is not None:
+                yield (path_str, *self._analyse_deduplicated(path_str, brace_config, tracker, seen))
+                continue
+            try:
+                result = self.analyse_file(path_str, brace_config, tracker)
+            except Exception as e:
+                yield path_str, None, f'{type(e).__name__}: {e}'
+            else:
+                yield path_str, result, None
+
+    def _analyse_deduplicated(self, path_str: str, brace_config: Optional[BraceConfig], tracker: Optional[OutlierTracker], seen: Dict[Tuple[Type[LanguageAnalyser], bytes], Tuple[Optional[AnalyserResult], Optional[str], str]]) -> Tuple[Optional[AnalyserResult], Optional[str]]:
+        key = None
+        try:
+            AnalyserClass = self._analyser_class(path_str)
+            start = time.perf_counter()
+            with open(path_str, 'rb') as f:
+                data = f.read()
+            # the same bytes can be analysed differently per language (e.g. .c and .cpp), so the class is part of the key:
+            key = (AnalyserClass, hashlib.blake2b(data, digest_size=16).digest())
+            if key in seen:
+                result, error, original = seen[key]
+                if tracker is not None and result is not None:
+                    tracker.record_duplicate(original, path_str)
+                return result, error
+            source = _decode_source(data)
+            read_time = time.perf_counter() - start
+            outcome = self._analyse_read_source(path_str, AnalyserClass, source, len(data), read_time, brace_config, tracker), None
+        except Exception as e:
+            outcome = None, f'{type(e).__name__}: {e}'
+        if key is not None:
+            seen[key] = (*outcome, path_str)
+        return outcome
+
+    def analyse_files(self, filepaths: Iterable[Union[str, Path]], brace_config: Optional[BraceConfig] = None, tracker: Optional[OutlierTracker] = None, budget: Optional[AnalysisBudget] = None, deduplicate: bool = False, workers: int = 0, batch_size: int = 64) -> ProjectReport:
+        """Analyse a batch of source files and collect the results into a ProjectReport
+
+        Args:
+            filepaths (Iterable[Union[str, Path]]): Paths to the source files
+            brace_config (Optional[BraceConfig], optional): Optional brace style config. Defaults to None.
+            tracker (Optional[OutlierTracker], optional): Collects the slowest and largest files of the batch. Defaults to None.
+            budget (Optional[AnalysisBudget], optional): Stop as soon as this budget is exceeded. Defaults to None.
+            deduplicate (bool, optional): Analyse byte-identical files only once (see iter_analyse). Defaults to False.
+            workers (int, optional): Number of worker processes, or 0 to analyse in this process. Defaults to 0.
+            batch_size (int, optional): Number of files per worker batch. Defaults to 64.
+
+        Returns:
+            ProjectReport: Per-file results, plus errors for files that could not be analysed
+        """
+        report = ProjectReport()
+        checker = budget.checker() if budget else None
+        if budget:
+            filepaths = budget.order(filepaths)
+        outcomes = self.iter_analyse(filepaths, brace_config, tracker, deduplicate, workers, batch_size)
+        try:
+            for path, result, error in outcomes:
+                report.add(path, result, error)
+                if checker:
+                    report.budget_exceeded = checker.add(path, result, error)
+                    if report.budget_exceeded:
+                        break
+        finally:
+            # cancels any outstanding work:
+            outcomes.close()
+        return report
+
+    def analyse_directory(self, root: Union[str, Path], brace_config: Optional[BraceConfig] = None, tracker: Optional[OutlierTracker] = None, budget: Optional[AnalysisBudget] = None, exclude_dirs: Collection[str] = DEFAULT_EXCLUDED_DIRS, use_gitignore: bool = True, deduplicate: bool = False, workers: int = 0, batch_size: int = 64) -> ProjectReport:
+        """Discover and analyse every supported source file below a directory
+
+        Files are analysed as they are discovered, skipping excluded and .gitignore'd directories.
+
+        Args:
+            root (Union[str, Path]): Directory to analyse
+            brace_config (Optional[BraceConfig], optional): Optional brace style config. Defaults to None.
+            tracker (Optional[OutlierTracker], optional): Collects the slowest and largest files of the batch. Defaults to None.
+            budget (Optional[AnalysisBudget], optional): Stop as soon as this budget is exceeded. Defaults to None.
+            exclude_dirs (Collection[str], optional): Directory names to skip anywhere in the tree. Defaults to DEFAULT_EXCLUDED_DIRS.
+            use_gitignore (bool, optional): Whether to honour .gitignore files in the tree. Defaults to True.
+            deduplicate (bool, optional): Analyse byte-identical files only once (see iter_analyse). Defaults to False.
+            workers (int, optional): Number of worker processes, or 0 to analyse in this process. Defaults to 0.
+            batch_size (int, optional): Number of files per worker batch. Defaults to 64.
+
+        Returns:
+            ProjectReport: Per-file results, plus errors for files that could not be analysed
+        """
+        filepaths = discover_sources(root, self.language_map, exclude_dirs, use_gitignore)
+        return self.analyse_files(filepaths, brace_config, tracker, budget, deduplicate, workers, batch_size)
@@ -0,0 +1,201 @@
+"""Columnar metrics table for project-wide statistics.
+
+Batch results are flattened into one NumPy array per metric (one row per file), so that statistics over
+millions of files are computed with vectorised operations. Requires the optional `metrics` extra (numpy).
+"""
+import os
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Type, Union
+from code_analyser.core.engine import LANGUAGE_MAP, ProjectReport
+from code_analyser.core.profiling import PHASES, FileProfile
+from code_analyser.languages.base import LanguageAnalyser
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError("The metrics table requires numpy: pip install code-analyser[metrics]") from e
+
+
+# integer columns, in table order:
+COUNT_COLUMNS = (
+    'path_id', 'language', 'directory', 'bytes', 'lines', 'comments',
+    'variables', 'functions', 'constants', 'classes',
+    'unused_variables', 'unused_functions', 'brace_violations',
+)
+# per-phase timings in seconds:
+TIME_COLUMNS = tuple(f'time_{phase}' for phase in PHASES)
+COLUMNS = COUNT_COLUMNS + TIME_COLUMNS
+
+
+def _npz_path(path: Union[str, Path]) -> str:
+    # np.savez appends the suffix when it is missing, so load has to as well:
+    path_str = os.fspath(path)
+    return path_str if path_str.endswith('.npz') else path_str + '.npz'
+
+
+def language_name(analyser_class: Type[LanguageAnalyser]) -> str:
+    name = analyser_class.__name__
+    return (name[:-len('Analyser')] if name.endswith('Analyser') else name).lower()
+
+
+class MetricsTable:
+    """One NumPy array per column, one row per analysed file.
+
+    `path_id`, `language` and `directory` index into the `paths`, `languages` and `directories` string tables.
+    Paths are stored as one UTF-8 blob (`path_data`) sliced by `path_offsets`, rather than as a fixed-width
+    string array sized by the longest path.
+    Sizes and line counts come from the results themselves; timing columns come from FileProfiles, and rows
+    without a profile hold NaN.
+    """
+
+    def __init__(self, columns: Mapping[str, np.ndarray], path_data: np.ndarray, path_offsets: np.ndarray, languages: np.ndarray, directories: np.ndarray) -> None:
+        missing = set(COLUMNS) - set(columns)
+        if missing:
+            raise ValueError(f"Missing metrics columns: {sorted(missing)}")
+        self.columns = dict(columns)
+        self.path_data = path_data
+        self.path_offsets = path_offsets
+        self.languages = languages
+        self.directories = directories
+
+    def __len__(self) -> int:
+        return len(self.path_offsets) - 1
+
+    @property
+    def paths(self) -> List[str]:
+        """All paths, in row order (decoded on each access)"""
+        blob = self.path_data.tobytes()
+        offsets = self.path_offsets.tolist()
+        return [blob[start:end].decode('utf-8', 'surrogateescape') for start, end in zip(offsets, offsets[1:])]
+
+    def path(self, row: int) -> str:
+        start, end = self.path_offsets[row], self.path_offsets[row + 1]
+        return self.path_data[start:end].tobytes().decode('utf-8', 'surrogateescape')
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    @classmethod
+    def from_report(cls, report: ProjectReport, profiles: Optional[Mapping[str, FileProfile]] = None, language_map: Optional[Mapping[str, Type[LanguageAnalyser]]] = None) -> 'MetricsTable':
+        """Build a table from the results of a batch.
+
+        Args:
+            report (ProjectReport): Batch results; files with errors are not included
+            profiles (Optional[Mapping[str, FileProfile]], optional): Per-file profiles for the timing columns, e.g. from OutlierTracker(keep_all=True).profiles. Defaults to None.
+            language_map (Optional[Mapping[str, Type[LanguageAnalyser]]], optional): Extension to analyser map used to name languages. Defaults to LANGUAGE_MAP.
+
+        Returns:
+            MetricsTable: The table, with rows in report order
+        """
+        language_map = language_map if language_map is not None else LANGUAGE_MAP
+        profiles = profiles or {}
+        n = len(report.results)
+        counts = np.full((len(COUNT_COLUMNS), n), -1, dtype=np.int64)
+        times = np.full((len(TIME_COLUMNS), n), np.nan, dtype=np.float64)
+        language_ids: Dict[str, int] = {}
+        directory_ids: Dict[str, int] = {}
+
+        for row, (path, result) in enumerate(report.results.items()):
+            analyser_class = language_map.get(os.path.splitext(path)[1])
+            language = language_name(analyser_class) if analyser_class else 'unknown'
+            directory = os.path.dirname(path)
+            ids = result.identifiers
+            counts[0, row] = row
+            counts[1, row] = language_ids.setdefault(language, len(language_ids))
+            counts[2, row] = directory_ids.setdefault(directory, len(directory_ids))
+            counts[3:, row] = (
+                result.size, result.lines, result.comment_count,
+                len(ids.variables), len(ids.functions), len(ids.constants), len(ids.classes),
+                len(result.unused_report.unused_variables), len(result.unused_report.unused_functions),
+                len(result.brace_report.violations) if result.brace_report else 0,
+            )
+            profile = profiles.get(path)
+            if profile is not None:
+                times[:, row] = [profile.timings.get(phase, np.nan) for phase in PHASES]
+
+        columns = {name: counts[i] for i, name in enumerate(COUNT_COLUMNS)}
+        columns.update({name: times[i] for i, name in enumerate(TIME_COLUMNS)})
+        encoded = [path.encode('utf-8', 'surrogateescape') for path in report.results]
+        path_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(path) for path in encoded], out=path_offsets[1:])
+        return cls(
+            columns,
+            np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            path_offsets,
+            np.array(list(language_ids), dtype=str),
+            np.array(list(directory_ids), dtype=str)
+        )
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save the table as an uncompressed .npz archive (fast to reload, no pickling); '.npz' is appended if missing"""
+        np.savez(_npz_path(path), path_data=self.path_data, path_offsets=self.path_offsets,
+                 languages=self.languages, directories=self.directories, **self.columns)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'MetricsTable':
+        """Load a table saved by `save`, from the same path it was given"""
+        with np.load(_npz_path(path), allow_pickle=False) as data:
+            columns = {name: data[name] for name in COLUMNS}
+            return cls(columns, data['path_data'], data['path_offsets'], data['languages'], data['directories'])
+
+    def comment_density(self) -> np.ndarray:
+        """Comments per line for each file, NaN where the line count is unknown or zero"""
+        lines = self.columns['lines'].astype(np.float64)
+        lines[lines <= 0] = np.nan
+        return self.columns['comments'] / lines
+
+    def percentiles(self, values: Union[str, np.ndarray], q: Sequence[float] = (50, 90, 99)) -> np.ndarray:
+        """Percentiles of a column (or derived values), ignoring NaNs and unknown (-1) counts
+
+        Args:
+            values (Union[str, np.ndarray]): Column name, or an array with one value per row
+            q (Sequence[float], optional): Percentiles to compute. Defaults to (50, 90, 99).
+
+        Returns:
+            np.ndarray: One value per requested percentile
+        """
+        return np.nanpercentile(self._values(values), q)
+
+    def histogram(self, values: Union[str, np.ndarray], bins: Union[int, Sequence[float]] = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """Histogram of a column (or derived values), ignoring NaNs and unknown (-1) counts
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (counts, bin edges), as np.histogram
+        """
+        data = self._values(values)
+        return np.histogram(data[~np.isnan(data)], bins=bins)
+
+    def group_by_directory(self, values: Union[str, np.ndarray], how: str = 'sum') -> Dict[str, float]:
+        """Aggregate a column (or derived values) per directory
+
+        Args:
+            values (Union[str, np.ndarray]): Column name, or an array with one value per row
+            how (str, optional): 'sum', 'mean' or 'count'. Defaults to 'sum'.
+
+        Returns:
+            Dict[str, float]: Aggregate per directory; NaN and unknown values are skipped
+        """
+        data = self._values(values)
+        valid = ~np.isnan(data)
+        groups = self.columns['directory'][valid]
+        size = len(self.directories)
+        counts = np.bincount(groups, minlength=size)
+        if how == 'count':
+            totals = counts.astype(np.float64)
+        else:
+            totals = np.bincount(groups, weights=data[valid], minlength=size)
+            if how == 'mean':
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    totals = totals / counts
+            elif how != 'sum':
+                raise ValueError(f"Unknown aggregation: {how}")
+        return dict(zip(self.directories.tolist(), totals.tolist()))
+
+    def _values(self, values: Union[str, np.ndarray]) -> np.ndarray:
+        if isinstance(values, str):
+            column = self.columns[values]
+            if column.dtype.kind == 'i':
+                column = column.astype(np.float64)
+                column[column < 0] = np.nan
+            return column
+        return np.asarray(values, dtype=np.float64)
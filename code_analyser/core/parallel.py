@@ -0,0 +1,170 @@
+import hashlib
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Type, Union
+from code_analyser.core.engine import AnalyserEngine, AnalyserResult, _decode_source
+from code_analyser.languages.base import LanguageAnalyser
+from code_analyser.utils.brace import BraceConfig
+
+
+Outcome = Tuple[str, Optional[AnalyserResult], Optional[str]]
+
+DIGEST_SIZE = 16
+# digest sent for files that could not be read (their error is always among the outcomes):
+_NO_DIGEST = bytes(DIGEST_SIZE)
+
+# content keys already analysed by this worker process, reset by the pool initializer:
+_worker_seen: Set[Tuple[Type[LanguageAnalyser], bytes]] = set()
+# set by the parent when it stops consuming results; workers check it between files:
+_worker_cancel = None
+
+
+def _init_worker(cancel) -> None:
+    global _worker_cancel
+    _worker_cancel = cancel
+    _worker_seen.clear()
+
+
+def _cancelled() -> bool:
+    return _worker_cancel is not None and _worker_cancel.is_set()
+
+
+def _analyse_batch(language_map: Mapping[str, Type[LanguageAnalyser]], filepaths: List[str], brace_config: Optional[BraceConfig]) -> List[Outcome]:
+    # runs in a worker process; the whole batch goes back as one pickled message:
+    engine = AnalyserEngine()
+    engine.language_map = dict(language_map)
+    outcomes = []
+    for outcome in engine.iter_analyse(filepaths, brace_config):
+        outcomes.append(outcome)
+        if _cancelled():
+            break
+    return outcomes
+
+
+def _analyse_batch_deduplicated(language_map: Mapping[str, Type[LanguageAnalyser]], filepaths: List[str], brace_config: Optional[BraceConfig]) -> Tuple[List[Outcome], bytes]:
+    # runs in a worker process; each file is read and hashed once here. Files whose content this worker has
+    #  already analysed are left out of the outcomes, and the parent fans the first copy's outcome out to them:
+    engine = AnalyserEngine()
+    engine.language_map = dict(language_map)
+    outcomes = []
+    digests = []
+    for path_str in filepaths:
+        if _cancelled():
+            break
+        try:
+            AnalyserClass = engine._analyser_class(path_str)
+            with open(path_str, 'rb') as f:
+                data = f.read()
+        except Exception as e:
+            outcomes.append((path_str, None, f'{type(e).__name__}: {e}'))
+            digests.append(_NO_DIGEST)
+            continue
+        digest = hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+        digests.append(digest)
+        key = (AnalyserClass, digest)
+        if key in _worker_seen:
+            continue
+        _worker_seen.add(key)
+        try:
+            result = engine._analyse_read_source(path_str, AnalyserClass, _decode_source(data), len(data), 0.0, brace_config, None)
+        except Exception as e:
+            outcomes.append((path_str, None, f'{type(e).__name__}: {e}'))
+        else:
+            outcomes.append((path_str, result, None))
+    return outcomes, b''.join(digests)
+
+
+def iter_analyse_parallel(engine: AnalyserEngine, filepaths: Iterable[Union[str, Path]], brace_config: Optional[BraceConfig], workers: int, batch_size: int, deduplicate: bool = False) -> Iterator[Outcome]:
+    """Analyse files in a process pool, yielding outcomes as batches finish
+
+    Paths are consumed lazily and at most two batches per worker are outstanding, so discovery can feed the
+    pool as it goes. Closing the generator cancels the outstanding batches: those still queued are dropped, and
+    workers stop a running batch after the file they are analysing.
+
+    Args:
+        engine (AnalyserEngine): Engine whose language map the workers use
+        filepaths (Iterable[Union[str, Path]]): Paths to the source files
+        brace_config (Optional[BraceConfig]): Optional brace style config
+        workers (int): Number of worker processes
+        batch_size (int): Number of files sent to a worker at a time
+        deduplicate (bool, optional): Have workers hash each file as they read it and return its digest, so that
+            byte-identical files are analysed and sent back once per worker and the outcome is fanned out here.
+            This process does no file I/O. Defaults to False.
+
+    Yields:
+        Outcome: (path, result, error), in completion order
+    """
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be positive: {batch_size}")
+    paths = iter(filepaths)
+    exhausted = False
+    ready = deque()
+    # deduplication state: content key -> outcome of the first copy, and duplicates whose first copy
+    #  (analysed by the same worker) is in a batch that has not been handled yet:
+    known: Dict[Tuple[Type[LanguageAnalyser], bytes], Tuple[Optional[AnalyserResult], Optional[str]]] = {}
+    waiting: Dict[Tuple[Type[LanguageAnalyser], bytes], List[str]] = {}
+
+    def next_batch() -> List[str]:
+        nonlocal exhausted
+        batch = []
+        while len(batch) < batch_size:
+            try:
+                batch.append(os.fspath(next(paths)))
+            except StopIteration:
+                exhausted = True
+                break
+        return batch
+
+    def fan_out(batch: List[str], batch_outcomes: List[Outcome], digests: bytes) -> None:
+        outcomes = iter(batch_outcomes)
+        outcome = next(outcomes, None)
+        for i, path_str in enumerate(batch):
+            digest = digests[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE]
+            # outcomes are in batch order, with the worker's duplicates left out:
+            if outcome is not None and outcome[0] == path_str:
+                ready.append(outcome)
+                if digest != _NO_DIGEST:
+                    key = (engine._analyser_class(path_str), digest)
+                    known.setdefault(key, outcome[1:])
+                    ready.extend((duplicate, *outcome[1:]) for duplicate in waiting.pop(key, ()))
+                outcome = next(outcomes, None)
+                continue
+            key = (engine._analyser_class(path_str), digest)
+            if key in known:
+                ready.append((path_str, *known[key]))
+            else:
+                waiting.setdefault(key, []).append(path_str)
+
+    context = multiprocessing.get_context()
+    cancel = context.Event()
+    pool = ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(cancel,))
+    pending: Dict[Future, List[str]] = {}
+    try:
+        while True:
+            while not exhausted and len(pending) < 2 * workers:
+                batch = next_batch()
+                if batch:
+                    task = _analyse_batch_deduplicated if deduplicate else _analyse_batch
+                    pending[pool.submit(task, engine.language_map, batch, brace_config)] = batch
+            while ready:
+                yield ready.popleft()
+            if not pending:
+                if exhausted:
+                    break
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = pending.pop(future)
+                if deduplicate:
+                    fan_out(batch, *future.result())
+                else:
+                    ready.extend(future.result())
+    finally:
+        # batches already handed to the pool's call queue cannot be cancelled through their futures:
+        cancel.set()
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False)
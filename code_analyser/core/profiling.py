@@ -0,0 +1,126 @@
+import hashlib
+import heapq
+import os
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+
+# analysis phases timed by the engine, in the order they run. 'lex' is the shared lexer scan of brace-family
+#  languages, timed on its own so that 'braces' and 'comments' (which reuse it) exclude lexing:
+PHASES = ('read', 'lex', 'parse', 'identifiers', 'braces', 'comments', 'unused')
+
+
+@dataclass
+class FileProfile:
+    """Per-file size, timing and AST shape measurements.
+
+    Attributes:
+        path (str): Path of the analysed file
+        size (int): File size in bytes
+        lines (int): Number of lines in the file
+        timings (Dict[str, float]): Seconds spent in each phase (see PHASES); 'lex' is 0 for languages without the shared lexer
+        node_count (int): Number of AST nodes (brace tokens for languages without a parser)
+        max_depth (int): Deepest AST nesting (brace nesting for languages without a parser)
+        profile_path (Optional[str]): Path of the cProfile dump, if one was captured
+    """
+    path: str
+    size: int
+    lines: int
+    timings: Dict[str, float] = field(default_factory=dict)
+    node_count: int = 0
+    max_depth: int = 0
+    profile_path: Optional[str] = None
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.timings.values())
+
+
+@dataclass
+class OutlierReport:
+    slowest: List[FileProfile]
+    largest: List[FileProfile]
+
+    def format(self) -> str:
+        """Render the report as a plain text table"""
+        out = []
+        for title, profiles in (('Slowest files', self.slowest), ('Largest files', self.largest)):
+            out.append(f'{title}:')
+            for profile in profiles:
+                phases = ', '.join(f'{phase}={profile.timings.get(phase, 0.0) * 1000:.1f}ms' for phase in PHASES)
+                line = (f'  {profile.path}: {profile.total_time * 1000:.1f}ms, {profile.size} bytes, {profile.lines} lines, '
+                        f'{profile.node_count} nodes, depth {profile.max_depth} ({phases})')
+                if profile.profile_path:
+                    line += f' [profile: {profile.profile_path}]'
+                out.append(line)
+        return '\n'.join(out)
+
+
+class OutlierTracker:
+    """Keeps the top-N slowest and largest files seen during a batch.
+
+    Optionally, any file whose total analysis time exceeds `profile_threshold` seconds is re-analysed
+    under cProfile and the stats are dumped into `profile_dir`. With `keep_all`, the profile of every
+    file is also kept in `profiles`, keyed by path (e.g. for building a metrics table).
+    """
+
+    def __init__(self, top_n: int = 10, profile_threshold: Optional[float] = None, profile_dir: Optional[Union[str, Path]] = None, keep_all: bool = False) -> None:
+        if profile_threshold is not None and profile_dir is None:
+            raise ValueError("profile_dir is required when profile_threshold is set")
+        self.top_n = top_n
+        self.profile_threshold = profile_threshold
+        self.profile_dir = os.fspath(profile_dir) if profile_dir is not None else None
+        if self.profile_dir is not None:
+            os.makedirs(self.profile_dir, exist_ok=True)
+        # min-heaps of (key, sequence number, profile), so the smallest entry is evicted first:
+        self._slowest: List[Tuple[float, int, FileProfile]] = []
+        self._largest: List[Tuple[int, int, FileProfile]] = []
+        self._count = 0
+        self.profiles: Optional[Dict[str, FileProfile]] = {} if keep_all else None
+
+    def should_profile(self, profile: FileProfile) -> bool:
+        return self.profile_threshold is not None and profile.total_time > self.profile_threshold
+
+    def profile_path_for(self, path: str) -> str:
+        # the basename keeps dumps recognisable, the hash keeps them unique:
+        digest = hashlib.blake2b(os.fsencode(path), digest_size=6).hexdigest()
+        return os.path.join(self.profile_dir, f'{os.path.basename(path)}.{digest}.prof')
+
+    def record(self, profile: FileProfile) -> None:
+        self._count += 1
+        if self.profiles is not None:
+            self.profiles[profile.path] = profile
+        self._push(self._slowest, (profile.total_time, self._count, profile))
+        self._push(self._largest, (profile.size, self._count, profile))
+
+    def record_duplicate(self, original: str, path: str) -> None:
+        """Record a byte-identical copy of an already recorded file
+
+        With `keep_all`, the copy gets its own entry in `profiles` (the original's measurements, under its own path).
+        It is not ranked as an outlier, since it was not analysed again.
+
+        Args:
+            original (str): Path of the file that was analysed
+            path (str): Path of the copy
+        """
+        if self.profiles is not None and original in self.profiles:
+            profile = self.profiles[original]
+            self.profiles[path] = replace(profile, path=path, timings=dict(profile.timings))
+
+    def _push(self, heap: list, entry: tuple) -> None:
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, entry)
+        elif entry[0] > heap[0][0]:
+            heapq.heapreplace(heap, entry)
+
+    def report(self) -> OutlierReport:
+        """Get the outliers seen so far, largest first
+
+        Returns:
+            OutlierReport: The top-N slowest and largest files
+        """
+        return OutlierReport(
+            [profile for _, _, profile in sorted(self._slowest, key=lambda e: e[0], reverse=True)],
+            [profile for _, _, profile in sorted(self._largest, key=lambda e: e[0], reverse=True)]
+        )
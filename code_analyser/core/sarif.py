@@ -0,0 +1,176 @@
+"""Streaming SARIF 2.1.0 output for CI code scanning.
+
+Findings are written to the stream as each file finishes, so memory use does not grow with the
+number of files analysed.
+"""
+import json
+import os
+from pathlib import Path
+from urllib.parse import quote
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Union
+from code_analyser.core.engine import AnalyserEngine, AnalyserResult
+from code_analyser.utils.brace import BraceConfig
+
+
+SARIF_VERSION = '2.1.0'
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+SRCROOT = '%SRCROOT%'
+
+RULES = [
+    {
+        'id': 'unused-variable',
+        'shortDescription': {'text': 'Variable is assigned but never used'},
+        'defaultConfiguration': {'level': 'warning'},
+    },
+    {
+        'id': 'unused-function',
+        'shortDescription': {'text': 'Function is defined but never called'},
+        'defaultConfiguration': {'level': 'warning'},
+    },
+    {
+        'id': 'brace-style',
+        'shortDescription': {'text': 'Brace placement does not match the configured style'},
+        'defaultConfiguration': {'level': 'note'},
+    },
+]
+_RULE_INDEX = {rule['id']: i for i, rule in enumerate(RULES)}
+
+
+class SarifWriter:
+    """Writes a single-run SARIF log incrementally.
+
+    The document header is written on construction, each `add_result` call appends that file's findings,
+    and `close` writes the tool execution notifications and closes the document. Use as a context manager
+    to make sure the document is closed.
+    """
+
+    def __init__(self, stream: TextIO, root: Optional[Union[str, Path]] = None, tool_name: str = 'code-analyser', tool_version: str = '0.1.0') -> None:
+        """
+        Args:
+            stream (TextIO): Where to write the SARIF document
+            root (Optional[Union[str, Path]], optional): Source root; paths below it are reported relative to %SRCROOT%. Defaults to None.
+            tool_name (str, optional): Tool name reported in the log. Defaults to 'code-analyser'.
+            tool_version (str, optional): Tool version reported in the log. Defaults to '0.1.0'.
+        """
+        self._stream = stream
+        self._root = os.path.abspath(os.fspath(root)) if root is not None else None
+        self._first = True
+        self._closed = False
+        self._notifications: List[Dict[str, Any]] = []
+        self.finding_count = 0
+
+        header = {
+            'version': SARIF_VERSION,
+            '$schema': SARIF_SCHEMA,
+        }
+        run = {'tool': {'driver': {'name': tool_name, 'version': tool_version, 'rules': RULES}}}
+        if self._root is not None:
+            run['originalUriBaseIds'] = {SRCROOT: {'uri': Path(self._root).as_uri() + '/'}}
+        # everything but the closing brackets; results are streamed into the open array:
+        self._stream.write(json.dumps(header)[:-1] + ', "runs": [' + json.dumps(run)[:-1] + ', "results": [')
+
+    def add_result(self, path: Union[str, Path], result: AnalyserResult) -> None:
+        """Append the findings of one file
+
+        Args:
+            path (Union[str, Path]): Path of the analysed file
+            result (AnalyserResult): Its analysis result
+        """
+        location = self._artifact_location(os.fspath(path))
+        for name, lineno in result.unused_report.unused_variables:
+            self._write_finding('unused-variable', f"Variable '{name}' is assigned but never used", location, lineno)
+        for name, lineno in result.unused_report.unused_functions:
+            self._write_finding('unused-function', f"Function '{name}' is defined but never called", location, lineno)
+        if result.brace_report:
+            for lineno, message in result.brace_report.violations:
+                self._write_finding('brace-style', message, location, lineno)
+
+    def add_error(self, path: Union[str, Path], error: str) -> None:
+        """Record a file that could not be analysed, as a tool execution notification"""
+        self._notifications.append({
+            'level': 'error',
+            'message': {'text': error},
+            'locations': [{'physicalLocation': {'artifactLocation': self._artifact_location(os.fspath(path))}}],
+        })
+
+    def close(self, exception: Optional[BaseException] = None) -> None:
+        """Write the invocation and close the document
+
+        Args:
+            exception (Optional[BaseException], optional): Exception that interrupted the run. The log is then marked
+                as unsuccessful, so a partial set of findings is not mistaken for a clean run. Defaults to None.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if exception is not None:
+            self._notifications.append({
+                'level': 'error',
+                'message': {'text': f'Analysis interrupted, findings are incomplete: {type(exception).__name__}: {exception}'},
+                'exception': {'kind': type(exception).__name__, 'message': str(exception)},
+            })
+        invocation = {
+            'executionSuccessful': not self._notifications,
+            'toolExecutionNotifications': self._notifications,
+        }
+        self._stream.write('], "invocations": [' + json.dumps(invocation) + ']}]}\n')
+
+    def __enter__(self) -> 'SarifWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close(exc_value)
+
+    def _artifact_location(self, path: str) -> Dict[str, str]:
+        # relative paths are percent-encoded like as_uri() does for absolute ones, so they are valid URI references:
+        if self._root is not None:
+            abs_path = os.path.abspath(path)
+            if abs_path == self._root or abs_path.startswith(self._root + os.sep):
+                return {'uri': _quote_path(os.path.relpath(abs_path, self._root)), 'uriBaseId': SRCROOT}
+        if os.path.isabs(path):
+            return {'uri': Path(path).as_uri()}
+        return {'uri': _quote_path(path)}
+
+    def _write_finding(self, rule_id: str, message: str, location: Dict[str, str], lineno: int) -> None:
+        physical_location: Dict[str, Any] = {'artifactLocation': location}
+        # line numbers of 0 mean the position is unknown:
+        if lineno and lineno > 0:
+            physical_location['region'] = {'startLine': lineno}
+        finding = {
+            'ruleId': rule_id,
+            'ruleIndex': _RULE_INDEX[rule_id],
+            'message': {'text': message},
+            'locations': [{'physicalLocation': physical_location}],
+        }
+        if not self._first:
+            self._stream.write(',')
+        self._first = False
+        self._stream.write(json.dumps(finding))
+        self.finding_count += 1
+
+
+def _quote_path(path: str) -> str:
+    return quote(Path(path).as_posix(), safe='/', errors='surrogateescape')
+
+
+def write_sarif(filepaths: Iterable[Union[str, Path]], stream: TextIO, brace_config: Optional[BraceConfig] = None, root: Optional[Union[str, Path]] = None, engine: Optional[AnalyserEngine] = None) -> int:
+    """Analyse files and stream their findings to a SARIF document, without keeping results in memory
+
+    Args:
+        filepaths (Iterable[Union[str, Path]]): Paths to the source files
+        stream (TextIO): Where to write the SARIF document
+        brace_config (Optional[BraceConfig], optional): Optional brace style config. Defaults to None.
+        root (Optional[Union[str, Path]], optional): Source root for relative artifact locations. Defaults to None.
+        engine (Optional[AnalyserEngine], optional): Engine to analyse with. Defaults to a new AnalyserEngine.
+
+    Returns:
+        int: Number of findings written
+    """
+    engine = engine or AnalyserEngine()
+    with SarifWriter(stream, root) as writer:
+        for path, result, error in engine.iter_analyse(filepaths, brace_config):
+            if result is not None:
+                writer.add_result(path, result)
+            else:
+                writer.add_error(path, error)
+    return writer.finding_count
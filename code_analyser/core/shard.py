@@ -0,0 +1,317 @@
+"""Sharded analysis of large corpora.
+
+A corpus is split into deterministic shards by hashing each path. Every shard is then analysed by an
+independent engine invocation (typically on a separate machine) and the shard outputs are merged into
+a single ProjectReport. All coordination happens through files:
+
+    python -m code_analyser.core.shard plan manifest.json --root SRC --shards 8 [FILE... | --files-from LIST]
+    python -m code_analyser.core.shard run manifest.json 3 shard-3.json
+    python -m code_analyser.core.shard merge manifest.json report.json shard-*.json
+
+The merged report holds the per-file results and errors, plus the aggregate `totals` of the whole corpus.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from code_analyser.core.discovery import discover_sources
+from code_analyser.core.engine import AnalyserEngine, AnalyserResult, ProjectReport
+from code_analyser.utils.brace import BraceConfig, BraceReport
+from code_analyser.utils.identifiers import Identifiers
+from code_analyser.utils.unused import UnusedReport
+
+
+FORMAT_VERSION = 1
+
+
+def shard_of(path: str, num_shards: int) -> int:
+    """Deterministically assign a path to a shard.
+
+    Uses a stable hash of the posix form of the path (unlike the builtin `hash`, which is salted per process),
+    so every machine computes the same assignment.
+
+    Args:
+        path (str): Path relative to the corpus root
+        num_shards (int): Total number of shards
+
+    Returns:
+        int: Shard index in [0, num_shards)
+    """
+    # fsencode, so that names which are not valid UTF-8 (lone surrogates) hash too:
+    digest = hashlib.blake2b(os.fsencode(Path(path).as_posix()), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % num_shards
+
+
+@dataclass
+class ShardManifest:
+    root: str
+    num_shards: int
+    shards: List[List[str]]
+    brace_style: Optional[str] = None
+
+    @property
+    def brace_config(self) -> Optional[BraceConfig]:
+        return BraceConfig(self.brace_style) if self.brace_style else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': FORMAT_VERSION,
+            'root': self.root,
+            'num_shards': self.num_shards,
+            'brace_style': self.brace_style,
+            'shards': self.shards,
+        }
+
+    def digest(self) -> str:
+        """Content hash identifying this manifest, recorded in every shard output"""
+        encoded = json.dumps(self.to_dict(), sort_keys=True).encode('utf-8')
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    def save(self, path: Union[str, Path]) -> None:
+        _write_json(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'ShardManifest':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        _check_version(data, path)
+        return cls(data['root'], data['num_shards'], data['shards'], data.get('brace_style'))
+
+
+def build_manifest(filepaths: Iterable[Union[str, Path]], num_shards: int, root: Union[str, Path] = '.', brace_config: Optional[BraceConfig] = None) -> ShardManifest:
+    """Split a corpus into shards.
+
+    Args:
+        filepaths (Iterable[Union[str, Path]]): Source files, either absolute or relative to the current directory
+        num_shards (int): Number of shards to create
+        root (Union[str, Path], optional): Corpus root; manifest paths are stored relative to it. Defaults to '.'.
+        brace_config (Optional[BraceConfig], optional): Brace style config applied by every shard. Defaults to None.
+
+    Returns:
+        ShardManifest: The manifest, with each shard's paths sorted
+    """
+    if num_shards < 1:
+        raise ValueError(f"Number of shards must be positive: {num_shards}")
+    root_str = os.path.abspath(os.fspath(root))
+    shards = [set() for _ in range(num_shards)]
+    for filepath in filepaths:
+        rel = Path(os.path.relpath(os.path.abspath(os.fspath(filepath)), root_str)).as_posix()
+        shards[shard_of(rel, num_shards)].add(rel)
+    return ShardManifest(
+        root_str,
+        num_shards,
+        [sorted(shard) for shard in shards],
+        brace_config.style if brace_config else None
+    )
+
+
+def run_shard(manifest_path: Union[str, Path], shard_index: int, output_path: Union[str, Path], root: Optional[Union[str, Path]] = None, engine: Optional[AnalyserEngine] = None) -> ProjectReport:
+    """Analyse one shard of a manifest and write its output file.
+
+    Args:
+        manifest_path (Union[str, Path]): Path to the manifest
+        shard_index (int): Index of the shard to analyse
+        output_path (Union[str, Path]): Where to write the shard output
+        root (Optional[Union[str, Path]], optional): Overrides the manifest root, for machines that mount the corpus elsewhere. Defaults to None.
+        engine (Optional[AnalyserEngine], optional): Engine to analyse with. Defaults to a new AnalyserEngine.
+
+    Returns:
+        ProjectReport: The shard's results, keyed by manifest path
+    """
+    manifest = ShardManifest.load(manifest_path)
+    if not 0 <= shard_index < manifest.num_shards:
+        raise ValueError(f"Shard index {shard_index} out of range for {manifest.num_shards} shards")
+    engine = engine or AnalyserEngine()
+    root_str = os.fspath(root) if root is not None else manifest.root
+
+    rel_paths = manifest.shards[shard_index]
+    report = ProjectReport()
+    abs_paths = [os.path.join(root_str, rel) for rel in rel_paths]
+    for rel, (_, result, error) in zip(rel_paths, engine.iter_analyse(abs_paths, manifest.brace_config)):
+        report.add(rel, result, error)
+
+    _write_json(output_path, {
+        'version': FORMAT_VERSION,
+        'manifest': manifest.digest(),
+        'shard_index': shard_index,
+        'num_shards': manifest.num_shards,
+        **report_to_dict(report),
+    })
+    return report
+
+
+def merge_shards(manifest_path: Union[str, Path], output_paths: Sequence[Union[str, Path]]) -> ProjectReport:
+    """Merge shard outputs into a single ProjectReport.
+
+    Every shard of the manifest must be present exactly once, produced from this manifest, and cover exactly
+    the paths assigned to it, so the merged totals match an unsharded run.
+
+    Args:
+        manifest_path (Union[str, Path]): Path to the manifest the shards were run from
+        output_paths (Sequence[Union[str, Path]]): Shard output files, in any order
+
+    Returns:
+        ProjectReport: Combined results, grouped by shard
+    """
+    manifest = ShardManifest.load(manifest_path)
+    expected_digest = manifest.digest()
+    shard_reports: Dict[int, ProjectReport] = {}
+    for output_path in output_paths:
+        with open(output_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        _check_version(data, output_path)
+        if data['manifest'] != expected_digest:
+            raise ValueError(f"Shard output {output_path} was produced from a different manifest")
+        index = data['shard_index']
+        if index in shard_reports:
+            raise ValueError(f"Shard {index} given more than once")
+        shard_report = report_from_dict(data)
+        covered = set(shard_report.results) | set(shard_report.errors)
+        if covered != set(manifest.shards[index]):
+            raise ValueError(f"Shard output {output_path} does not cover the paths assigned to shard {index}")
+        shard_reports[index] = shard_report
+
+    missing = sorted(set(range(manifest.num_shards)) - set(shard_reports))
+    if missing:
+        raise ValueError(f"Missing shard outputs: {missing}")
+
+    merged = ProjectReport()
+    for index in range(manifest.num_shards):
+        merged.results.update(shard_reports[index].results)
+        merged.errors.update(shard_reports[index].errors)
+    return merged
+
+
+def result_to_dict(result: AnalyserResult) -> Dict[str, Any]:
+    return {
+        'identifiers': {
+            'variables': sorted(result.identifiers.variables),
+            'functions': sorted(result.identifiers.functions),
+            'constants': sorted(result.identifiers.constants),
+            'classes': sorted(result.identifiers.classes),
+        },
+        'brace_violations': [list(v) for v in result.brace_report.violations] if result.brace_report else None,
+        'comment_count': result.comment_count,
+        'unused_variables': [list(u) for u in result.unused_report.unused_variables],
+        'unused_functions': [list(u) for u in result.unused_report.unused_functions],
+        'size': result.size,
+        'lines': result.lines,
+    }
+
+
+def result_from_dict(data: Dict[str, Any]) -> AnalyserResult:
+    ids = data['identifiers']
+    violations = data['brace_violations']
+    return AnalyserResult(
+        Identifiers(set(ids['variables']), set(ids['functions']), set(ids['constants']), set(ids['classes'])),
+        BraceReport([tuple(v) for v in violations]) if violations is not None else None,
+        data['comment_count'],
+        UnusedReport(
+            [tuple(u) for u in data['unused_variables']],
+            [tuple(u) for u in data['unused_functions']]
+        ),
+        data.get('size', -1),
+        data.get('lines', -1)
+    )
+
+
+def report_to_dict(report: ProjectReport) -> Dict[str, Any]:
+    return {
+        'results': {path: result_to_dict(result) for path, result in report.results.items()},
+        'errors': dict(report.errors),
+    }
+
+
+def report_totals(report: ProjectReport) -> Dict[str, int]:
+    return {
+        'files': report.file_count,
+        'errors': len(report.errors),
+        'comments': report.comment_count,
+        'unused_variables': report.unused_variable_count,
+        'unused_functions': report.unused_function_count,
+        'brace_violations': report.brace_violation_count,
+    }
+
+
+def report_from_dict(data: Dict[str, Any]) -> ProjectReport:
+    return ProjectReport(
+        {path: result_from_dict(result) for path, result in data['results'].items()},
+        dict(data['errors'])
+    )
+
+
+def _read_file_list(path: str) -> Iterator[str]:
+    # newline-separated paths, from a file or '-' for stdin; blank lines are skipped:
+    stream = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8', errors='surrogateescape')
+    try:
+        for line in stream:
+            line = line.rstrip('\r\n')
+            if line:
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def _check_version(data: Dict[str, Any], path: Union[str, Path]) -> None:
+    if data.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported shard file version in {path}: {data.get('version')}")
+
+
+def _write_json(path: Union[str, Path], data: Dict[str, Any]) -> None:
+    # write then rename, so a reader never sees a partially written file:
+    path_str = os.fspath(path)
+    tmp_path = f'{path_str}.tmp.{os.getpid()}'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path_str)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m code_analyser.core.shard', description='Sharded multi-node analysis')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    plan = commands.add_parser('plan', help='split files into a shard manifest',
+                               description='Files are taken from the command line and --files-from; if neither is given, '
+                                           'every supported source file under --root is discovered.')
+    plan.add_argument('manifest')
+    plan.add_argument('files', nargs='*')
+    plan.add_argument('--files-from', metavar='FILE', help="newline-separated list of files, or '-' for stdin")
+    plan.add_argument('--shards', type=int, required=True)
+    plan.add_argument('--root', default='.')
+    plan.add_argument('--brace-style', choices=['K&R', 'Allman', 'Whitesmith'])
+
+    run = commands.add_parser('run', help='analyse one shard')
+    run.add_argument('manifest')
+    run.add_argument('shard_index', type=int)
+    run.add_argument('output')
+    run.add_argument('--root')
+
+    merge = commands.add_parser('merge', help='merge shard outputs into one report')
+    merge.add_argument('manifest')
+    merge.add_argument('output')
+    merge.add_argument('shard_outputs', nargs='+')
+
+    args = parser.parse_args(argv)
+    if args.command == 'plan':
+        brace_config = BraceConfig(args.brace_style) if args.brace_style else None
+        if args.files or args.files_from:
+            filepaths = itertools.chain(args.files, _read_file_list(args.files_from) if args.files_from else ())
+        else:
+            filepaths = discover_sources(args.root)
+        build_manifest(filepaths, args.shards, args.root, brace_config).save(args.manifest)
+    elif args.command == 'run':
+        run_shard(args.manifest, args.shard_index, args.output, args.root)
+    else:
+        report = merge_shards(args.manifest, args.shard_outputs)
+        _write_json(args.output, {'version': FORMAT_VERSION, 'totals': report_totals(report), **report_to_dict(report)})
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
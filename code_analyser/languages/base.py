@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 from code_analyser.utils.identifiers import Identifiers
 from code_analyser.utils.brace import BraceConfig, BraceReport
 from code_analyser.utils.unused import UnusedReport
@@ -67,3 +67,14 @@ class LanguageAnalyser(ABC):
             UnusedReport: An UnusedReport listing unused variables and functions.
         """
         pass
+
+    def ast_stats(self, ast: Any) -> Tuple[int, int]:
+        """Measure the size and shape of the AST, for profiling pathological inputs.
+
+        Args:
+            ast (Any): The AST or intermediate representation
+
+        Returns:
+            Tuple[int, int]: (node count, maximum nesting depth), or (0, 0) if not supported for the language
+        """
+        return 0, 0
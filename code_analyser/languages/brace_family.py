@@ -0,0 +1,103 @@
+from code_analyser.languages.base import LanguageAnalyser
+from code_analyser.utils.identifiers import Identifiers
+from code_analyser.utils.brace import BraceConfig, BraceReport
+from code_analyser.utils.lexer import Lexer, LexerSpec, LexResult
+from code_analyser.utils.unused import UnusedReport
+from typing import Any, Dict, Optional, Tuple
+import warnings
+
+
+# compiled lexers are shared between analyser instances, keyed by spec:
+_LEXERS: Dict[LexerSpec, Lexer] = {}
+
+
+def get_lexer(spec: LexerSpec) -> Lexer:
+    lexer = _LEXERS.get(spec)
+    if lexer is None:
+        lexer = _LEXERS[spec] = Lexer(spec)
+    return lexer
+
+
+class BraceFamilyAnalyser(LanguageAnalyser):
+    """Base class for languages with C-style comments and braces.
+
+    Comment counting and brace style checks are driven by the `lexer_spec` table of the subclass,
+    so both share a single scan of the source.
+    """
+    lexer_spec: LexerSpec = LexerSpec()
+
+    def __init__(self) -> None:
+        self._lexer = get_lexer(self.lexer_spec)
+        self._last_scan = None
+
+    def scan(self, source: str) -> LexResult:
+        # the engine checks braces and counts comments on the same source string,
+        #  so remember the last scan rather than lexing it twice:
+        if self._last_scan is not None and self._last_scan[0] is source:
+            return self._last_scan[1]
+        result = self._lexer.scan(source)
+        self._last_scan = (source, result)
+        return result
+
+    def check_brace_style(self, source: str, config: BraceConfig) -> BraceReport:
+        # this is wip and very buggy
+        warnings.warn(
+            "This function is a Work In Progress and may change, produce incorrect results or be removed entirely.",
+            category=UserWarning,
+            stacklevel=2
+        )
+        violations = []
+        # split on '\n' only, so that line numbers agree with the lexer:
+        lines = source.split('\n')
+        style = config.style if config else BraceConfig('K&R').style
+
+        for lineno in self.scan(source).open_brace_lines(self.lexer_spec.braces[0]):
+            line = lines[lineno - 1]
+            stripped = line.strip()
+            if style == 'K&R':
+                # { should be on same line as control statement/method
+                if stripped == '{':
+                    violations.append(
+                        (lineno, f'Brace should be on same line ({style})'))
+            elif style == 'Allman':
+                # { should be on its own line
+                if stripped != '{':
+                    violations.append(
+                        (lineno, f'Brace should be on its own line ({style})'))
+            elif style == 'Whitesmith':
+                # { should be on its own line and indented (ew)
+                if stripped != '{' or (line and not (line.startswith(' ') or line.startswith('\t'))):
+                    violations.append(
+                        (lineno, f'Brace should be indented on its own line ({style})'))
+        return BraceReport(violations)
+
+    def count_comments(self, ast: Any, source: Optional[str] = None) -> int:
+        if not source:
+            return 0
+        return self.scan(source).comment_count
+
+
+class LexicalAnalyser(BraceFamilyAnalyser):
+    """Brace-family analyser for languages without a parser.
+
+    The lexer scan stands in for the AST, so only comment counts and brace checks are reported.
+    Identifiers and unused reports are always empty.
+    """
+
+    def parse(self, source: str) -> LexResult:
+        return self.scan(source)
+
+    def get_identifiers(self, ast: LexResult) -> Identifiers:
+        return Identifiers(set(), set(), set(), set())
+
+    def count_comments(self, ast: LexResult, source: Optional[str] = None) -> int:
+        if isinstance(ast, LexResult):
+            return ast.comment_count
+        return super().count_comments(ast, source)
+
+    def find_unused(self, ast: LexResult) -> UnusedReport:
+        return UnusedReport([], [])
+
+    def ast_stats(self, ast: LexResult) -> Tuple[int, int]:
+        # brace tokens and brace nesting stand in for AST nodes and depth:
+        return len(ast.braces), ast.max_depth
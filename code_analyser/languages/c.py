@@ -0,0 +1,9 @@
+from code_analyser.languages.brace_family import LexicalAnalyser
+from code_analyser.utils.lexer import LexerSpec
+
+
+C_SPEC = LexerSpec()
+
+
+class CAnalyser(LexicalAnalyser):
+    lexer_spec = C_SPEC
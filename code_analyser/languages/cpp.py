@@ -0,0 +1,13 @@
+from code_analyser.languages.brace_family import LexicalAnalyser
+from code_analyser.utils.lexer import LexerSpec, StringRule
+
+
+CPP_SPEC = LexerSpec(
+    strings=(StringRule('"', '"'), StringRule("'", "'")),
+    # raw strings, e.g. R"delim( ... )delim", with optional encoding prefix:
+    raw_literals=(r'(?:u8|u|U|L)?R"(?P<raw_delim>[^()\\\s]{0,16})\([\s\S]*?\)(?P=raw_delim)"',),
+)
+
+
+class CppAnalyser(LexicalAnalyser):
+    lexer_spec = CPP_SPEC
@@ -0,0 +1,19 @@
+from code_analyser.languages.brace_family import LexicalAnalyser
+from code_analyser.utils.lexer import LexerSpec, StringRule
+
+
+CSHARP_SPEC = LexerSpec(
+    strings=(
+        # verbatim strings escape quotes by doubling them:
+        StringRule('@"', '"', escape=None, multiline=True, doubled_close=True),
+        StringRule('$@"', '"', escape=None, multiline=True, doubled_close=True),
+        StringRule('@$"', '"', escape=None, multiline=True, doubled_close=True),
+        StringRule('"""', '"""', escape=None, multiline=True),  # raw string literals
+        StringRule('"', '"'),
+        StringRule("'", "'"),
+    ),
+)
+
+
+class CSharpAnalyser(LexicalAnalyser):
+    lexer_spec = CSHARP_SPEC
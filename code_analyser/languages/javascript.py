@@ -0,0 +1,26 @@
+from code_analyser.languages.brace_family import LexicalAnalyser
+from code_analyser.utils.lexer import LexerSpec, StringRule
+
+
+# a '/' only starts a regex literal where an expression may begin. Without a parser this is decided
+#  conservatively from the character or keyword before it (optionally separated by spaces); everywhere
+#  else (e.g. after an identifier, a property such as `a.in`, ')' or '}') it is read as division:
+_REGEX_PRECEDERS = '|'.join(
+    [r'(?<=[(,=:\[!&|?{;])', r'(?<=\A)']
+    + [rf'(?<=\b{keyword})(?<!\.{keyword})' for keyword in ('return', 'typeof', 'instanceof', 'case', 'delete', 'void', 'throw', 'in', 'of', 'do', 'else', 'yield', 'await')]
+)
+# the body cannot start with '*' or '/' (those are comments), and a '/' inside a character class does not end it:
+_REGEX_LITERAL = rf'(?:{_REGEX_PRECEDERS})[ \t]*/(?![*/])(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\[\n])+/[A-Za-z]*'
+
+JAVASCRIPT_SPEC = LexerSpec(
+    strings=(
+        StringRule('"', '"'),
+        StringRule("'", "'"),
+        StringRule('`', '`', multiline=True),  # template literals
+    ),
+    raw_literals=(_REGEX_LITERAL,),
+)
+
+
+class JavaScriptAnalyser(LexicalAnalyser):
+    lexer_spec = JAVASCRIPT_SPEC
@@ -1,11 +1,35 @@
 import ast
 import io
+import re
 import tokenize
+from dataclasses import dataclass
 from code_analyser.languages.base import LanguageAnalyser
 from code_analyser.utils.identifiers import Identifiers
 from code_analyser.utils.brace import BraceConfig, BraceReport
 from code_analyser.utils.unused import UnusedReport
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# line breaks as understood by the parser (unlike str.splitlines, which also breaks on e.g. form feeds):
+_LINE_RE = re.compile(r'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+$')
+
+
+@dataclass
+class DefinitionSummary:
+    """Position independent analysis of one top-level statement (or group of statements sharing lines).
+
+    Line numbers are relative to the first line of the segment, and declarations are keyed by
+    (depth, sequence) in a breadth first walk of the segment, so summaries can be reused wherever the
+    same text appears and merged in the same order as `ast.walk` over the whole module.
+    """
+    identifiers: Identifiers
+    comment_lines: List[int]
+    docstring_count: int
+    multiline_comment_count: int
+    declared_variables: List[Tuple[int, int, str, int]]  # (depth, sequence, name, relative line)
+    declared_functions: List[Tuple[int, int, str, int]]
+    used_variables: Set[str]
+    used_functions: Set[str]
 
 
 class PythonAnalyser(LanguageAnalyser):
@@ -115,3 +139,190 @@ class PythonAnalyser(LanguageAnalyser):
         unused_variables = [(name, lineno) for name, lineno in declared_variables.items() if name not in used_variables]
         unused_functions = [(name, lineno) for name, lineno in declared_functions.items() if name not in used_functions]
         return UnusedReport(unused_variables, unused_functions)
+
+    def ast_stats(self, ast_node: ast.AST) -> Tuple[int, int]:
+        node_count = 0
+        max_depth = 0
+        # iterative, so that deeply nested generated code can't hit the recursion limit:
+        stack = [(ast_node, 1)]
+        while stack:
+            node, depth = stack.pop()
+            node_count += 1
+            if depth > max_depth:
+                max_depth = depth
+            stack.extend((child, depth + 1) for child in ast.iter_child_nodes(node))
+        return node_count, max_depth
+
+    def analyse_incremental(self, source: str, cache: Dict[str, DefinitionSummary], brace_config: Optional[BraceConfig] = None) -> Tuple[Tuple[Identifiers, Optional[BraceReport], int, UnusedReport], Dict[str, DefinitionSummary], int]:
+        """Analyse source, reusing summaries of top-level statements whose text is unchanged.
+
+        The module is still parsed as a whole (to find statement boundaries and reject syntax errors),
+        but only statements missing from the cache are walked and tokenized.
+
+        Args:
+            source (str): The source code as a string
+            cache (Dict[str, DefinitionSummary]): Summaries from a previous call, keyed by statement text
+            brace_config (Optional[BraceConfig], optional): Optional brace style config. Defaults to None.
+
+        Returns:
+            Tuple: ((identifiers, brace report, comment count, unused report), summaries for the current source, number of statements re-analysed)
+        """
+        tree = self.parse(source)
+        lines = _LINE_RE.findall(source)
+        summaries: Dict[str, DefinitionSummary] = {}
+        reanalysed = 0
+
+        variables, functions, constants, classes = set(), set(), set(), set()
+        comment_lines = set()
+        docstring_count = 1 if ast.get_docstring(tree) else 0
+        multiline_comment_count = 0
+        declared_variables = []
+        declared_functions = []
+        used_variables = set()
+        used_functions = set()
+
+        prev_end = 0
+        for index, (start, end, statements) in enumerate(self._segments(tree)):
+            # only blank lines and comments can sit between top-level statements:
+            for lineno in range(prev_end + 1, start):
+                if lines[lineno - 1].lstrip().startswith('#'):
+                    comment_lines.add(lineno)
+            prev_end = end
+
+            text = ''.join(lines[start - 1:end])
+            summary = summaries.get(text) or cache.get(text)
+            if summary is None:
+                summary = self._summarise_segment(statements, text)
+                reanalysed += 1
+            summaries[text] = summary
+
+            offset = start - 1
+            variables |= summary.identifiers.variables
+            functions |= summary.identifiers.functions
+            classes |= summary.identifiers.classes
+            comment_lines.update(offset + lineno for lineno in summary.comment_lines)
+            docstring_count += summary.docstring_count
+            multiline_comment_count += summary.multiline_comment_count
+            declared_variables.extend((depth, index, seq, name, offset + lineno) for depth, seq, name, lineno in summary.declared_variables)
+            declared_functions.extend((depth, index, seq, name, offset + lineno) for depth, seq, name, lineno in summary.declared_functions)
+            used_variables |= summary.used_variables
+            used_functions |= summary.used_functions
+        for lineno in range(prev_end + 1, len(lines) + 1):
+            if lines[lineno - 1].lstrip().startswith('#'):
+                comment_lines.add(lineno)
+
+        # string expressions at module level are comments, unless they are the module docstring:
+        for i, node in enumerate(tree.body):
+            if i and isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+                multiline_comment_count += 1
+
+        # replay declarations in ast.walk order, so duplicate names resolve as in find_unused:
+        declared_variables.sort(key=lambda d: d[:3])
+        declared_functions.sort(key=lambda d: d[:3])
+        variable_lines = {}
+        for *_, name, lineno in declared_variables:
+            variable_lines[name] = lineno
+        function_lines = {}
+        for *_, name, lineno in declared_functions:
+            function_lines[name] = lineno
+        unused_variables = [(name, lineno) for name, lineno in variable_lines.items() if name not in used_variables]
+        unused_functions = [(name, lineno) for name, lineno in function_lines.items() if name not in used_functions]
+
+        return (
+            Identifiers(variables, functions, constants, classes),
+            self.check_brace_style(source, brace_config) if brace_config else None,
+            len(comment_lines) + docstring_count + multiline_comment_count,
+            UnusedReport(unused_variables, unused_functions)
+        ), summaries, reanalysed
+
+    def _segments(self, tree: ast.Module) -> List[Tuple[int, int, List[ast.stmt]]]:
+        # group top-level statements into (first line, last line, statements),
+        #  merging statements that share a line (e.g. `x = 1; y = 2`):
+        segments = []
+        for node in tree.body:
+            start = min([node.lineno] + [d.lineno for d in getattr(node, 'decorator_list', [])])
+            if segments and start <= segments[-1][1]:
+                segments[-1][1] = max(segments[-1][1], node.end_lineno)
+                segments[-1][2].append(node)
+            else:
+                segments.append([start, node.end_lineno, [node]])
+        return [tuple(segment) for segment in segments]
+
+    def _summarise_segment(self, statements: List[ast.stmt], text: str) -> DefinitionSummary:
+        first_lineno = statements[0].lineno
+        for d in getattr(statements[0], 'decorator_list', []):
+            first_lineno = min(first_lineno, d.lineno)
+        offset = first_lineno - 1
+
+        comment_lines = set()
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(text).readline):
+                if token.type == tokenize.COMMENT:
+                    comment_lines.add(token.start[0])
+        except Exception:  # ignore errors, as in count_comments
+            pass
+
+        # a single breadth first walk covers get_identifiers, count_comments and find_unused:
+        variables, functions, classes = set(), set(), set()
+        docstring_count = 0
+        multiline_comment_count = 0
+        declared_variables = []
+        declared_functions = []
+        used_variables = set()
+        used_functions = set()
+        level = [(node, None) for node in statements]
+        depth = 1
+        while level:
+            next_level = []
+            for seq, (node, parent) in enumerate(level):
+                if isinstance(node, ast.Assign):
+                    for target in node.targets:
+                        if isinstance(target, ast.Name):
+                            names = [target.id]
+                        elif isinstance(target, (ast.Tuple, ast.List)):
+                            names = [v.id for v in target.elts if isinstance(v, ast.Name)]
+                        else:
+                            names = []
+                        for name in names:
+                            variables.add(name)
+                            declared_variables.append((depth, seq, name, node.lineno - offset))
+
+                elif isinstance(node, ast.FunctionDef):
+                    functions.add(node.name)
+                    declared_functions.append((depth, seq, node.name, node.lineno - offset))
+                    if ast.get_docstring(node):
+                        docstring_count += 1
+
+                elif isinstance(node, ast.ClassDef):
+                    classes.add(node.name)
+                    if ast.get_docstring(node):
+                        docstring_count += 1
+
+                elif isinstance(node, ast.Name):
+                    if isinstance(node.ctx, ast.Load):
+                        used_variables.add(node.id)
+
+                elif isinstance(node, ast.Call):
+                    if isinstance(node.func, ast.Name):
+                        used_functions.add(node.func.id)
+
+                # top-level string expressions depend on their position in the module, so are counted by the caller:
+                elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and parent is not None:
+                    body = getattr(parent, 'body', None)
+                    if not (body and body[0] is node):
+                        multiline_comment_count += 1
+
+                next_level.extend((child, node) for child in ast.iter_child_nodes(node))
+            level = next_level
+            depth += 1
+
+        return DefinitionSummary(
+            Identifiers(variables, functions, set(), classes),
+            sorted(comment_lines),
+            docstring_count,
+            multiline_comment_count,
+            declared_variables,
+            declared_functions,
+            used_variables,
+            used_functions
+        )
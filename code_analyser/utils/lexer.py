@@ -0,0 +1,181 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Pattern, Tuple
+
+
+@dataclass(frozen=True)
+class StringRule:
+    """Describes a string or char literal by its delimiters.
+
+    Attributes:
+        open (str): Opening delimiter, including any prefix (e.g. '@"' for C# verbatim strings)
+        close (str): Closing delimiter
+        escape (Optional[str]): Escape character, or None if the literal has no escapes
+        multiline (bool): Whether the literal may span several lines
+        doubled_close (bool): Whether a doubled closing delimiter is an escaped delimiter (e.g. "" in C# verbatim strings)
+    """
+    open: str
+    close: str
+    escape: Optional[str] = '\\'
+    multiline: bool = False
+    doubled_close: bool = False
+
+
+@dataclass(frozen=True)
+class LexerSpec:
+    """Language specification table driving the shared lexer.
+
+    Attributes:
+        line_comments (Tuple[str, ...]): Markers that start a comment running to the end of the line
+        block_comments (Tuple[Tuple[str, str], ...]): (open, close) pairs of block comment delimiters
+        strings (Tuple[StringRule, ...]): String and char literal rules
+        raw_literals (Tuple[str, ...]): Regular expressions for literals that cannot be described by a StringRule
+        braces (Tuple[str, str]): Opening and closing brace tokens
+    """
+    line_comments: Tuple[str, ...] = ('//',)
+    block_comments: Tuple[Tuple[str, str], ...] = (('/*', '*/'),)
+    strings: Tuple[StringRule, ...] = (StringRule('"', '"'), StringRule("'", "'"))
+    raw_literals: Tuple[str, ...] = ()
+    braces: Tuple[str, str] = ('{', '}')
+
+
+@dataclass
+class LexResult:
+    """Result of scanning a source string.
+
+    Attributes:
+        comment_count (int): Number of comments found
+        braces (List[Tuple[int, str]]): (line number, brace token) for every brace outside comments and literals
+        max_depth (int): Deepest brace nesting reached
+    """
+    comment_count: int = 0
+    braces: List[Tuple[int, str]] = field(default_factory=list)
+    max_depth: int = 0
+
+    def open_brace_lines(self, open_token: str = '{') -> List[int]:
+        """Line numbers containing at least one opening brace, in ascending order
+
+        Args:
+            open_token (str, optional): The opening brace token. Defaults to '{'.
+
+        Returns:
+            List[int]: Line numbers (1-indexed)
+        """
+        lines = []
+        for lineno, token in self.braces:
+            if token == open_token and (not lines or lines[-1] != lineno):
+                lines.append(lineno)
+        return lines
+
+
+# token group names used in the compiled pattern:
+_COMMENT = 'comment'
+_LITERAL = 'literal'
+_OPEN = 'open'
+_CLOSE = 'close'
+
+
+def _string_pattern(rule: StringRule) -> str:
+    open_ = re.escape(rule.open)
+    close = re.escape(rule.close)
+    body = []
+    if rule.escape:
+        body.append(re.escape(rule.escape) + r'[\s\S]')
+    if rule.doubled_close:
+        body.append(close + close)
+    if len(rule.close) == 1:
+        # single character terminator, so a negated class avoids backtracking:
+        excluded = re.escape(rule.close) + (re.escape(rule.escape) if rule.escape else '')
+        if not rule.multiline:
+            excluded += r'\n'
+        body.append(f'[^{excluded}]')
+        return f'{open_}(?:{"|".join(body)})*{close}'
+    # the escape character must only be matched by the escape branch, or an unterminated literal
+    #  followed by escapes backtracks exponentially:
+    excluded = re.escape(rule.escape) if rule.escape else ''
+    if not rule.multiline:
+        excluded += r'\n'
+    body.append(f'[^{excluded}]' if excluded else r'[\s\S]')
+    return f'{open_}(?:{"|".join(body)})*?{close}'
+
+
+def compile_spec(spec: LexerSpec) -> Pattern[str]:
+    """Compile a LexerSpec into a single alternation pattern, so that a source string can be scanned in one pass.
+
+    Args:
+        spec (LexerSpec): The language specification table
+
+    Returns:
+        Pattern[str]: A compiled regular expression with one named group per token class
+    """
+    comments = []
+    for open_, close in spec.block_comments:
+        # unterminated block comments run to the end of the file:
+        comments.append(f'{re.escape(open_)}[\\s\\S]*?(?:{re.escape(close)}|\\Z)')
+    for marker in spec.line_comments:
+        comments.append(f'{re.escape(marker)}[^\\n]*')
+
+    literals = list(spec.raw_literals)
+    # longest opening delimiter first, so that e.g. '"""' is tried before '"':
+    for rule in sorted(spec.strings, key=lambda r: len(r.open), reverse=True):
+        literals.append(_string_pattern(rule))
+
+    parts = []
+    if comments:
+        parts.append(f'(?P<{_COMMENT}>{"|".join(comments)})')
+    if literals:
+        parts.append(f'(?P<{_LITERAL}>{"|".join(literals)})')
+    parts.append(f'(?P<{_OPEN}>{re.escape(spec.braces[0])})')
+    parts.append(f'(?P<{_CLOSE}>{re.escape(spec.braces[1])})')
+    return re.compile('|'.join(parts))
+
+
+class Lexer:
+    """Generic single pass lexer for brace-family languages, driven by a LexerSpec"""
+
+    def __init__(self, spec: LexerSpec) -> None:
+        self.spec = spec
+        self._pattern = compile_spec(spec)
+
+    def scan(self, source: str) -> LexResult:
+        """Scan the source once, counting comments and recording braces outside comments and literals.
+
+        Args:
+            source (str): The source code as a string
+
+        Returns:
+            LexResult: Comment count, brace tokens and maximum brace nesting depth
+        """
+        result = LexResult()
+        if not source:
+            return result
+        open_token, close_token = self.spec.braces
+        braces = result.braces
+        comment_count = 0
+        depth = 0
+        max_depth = 0
+        lineno = 1
+        last = 0
+        count_newlines = source.count
+        for match in self._pattern.finditer(source):
+            kind = match.lastgroup
+            if kind == _COMMENT:
+                comment_count += 1
+                continue
+            if kind == _LITERAL:
+                continue
+            start = match.start()
+            lineno += count_newlines('\n', last, start)
+            last = start
+            if kind == _OPEN:
+                braces.append((lineno, open_token))
+                depth += 1
+                if depth > max_depth:
+                    max_depth = depth
+            else:
+                braces.append((lineno, close_token))
+                if depth:
+                    depth -= 1
+        result.comment_count = comment_count
+        result.max_depth = max_depth
+        return result
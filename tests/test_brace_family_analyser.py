@@ -0,0 +1,174 @@
+import time
+from pathlib import Path
+from code_analyser.core.engine import AnalyserEngine
+from code_analyser.languages.c import CAnalyser
+from code_analyser.languages.cpp import CppAnalyser
+from code_analyser.languages.csharp import CSharpAnalyser
+from code_analyser.languages.java import JavaAnalyser
+from code_analyser.languages.javascript import JavaScriptAnalyser
+from code_analyser.utils.brace import BraceConfig
+from code_analyser.utils.lexer import Lexer, LexerSpec
+
+
+def test_lexer_counts_comments_and_braces():
+    source = '''/* header
+   spans lines { */
+int main() { // opening
+    char c = '{';
+    return 0;
+}
+'''
+    result = Lexer(LexerSpec()).scan(source)
+    assert result.comment_count == 2
+    assert result.braces == [(3, '{'), (6, '}')]
+    assert result.max_depth == 1
+
+
+def test_lexer_unterminated_block_comment():
+    result = Lexer(LexerSpec()).scan('int x; /* never closed {\n}')
+    assert result.comment_count == 1
+    assert result.braces == []
+
+
+def test_lexer_escaped_quote_in_string():
+    result = Lexer(LexerSpec()).scan('s = "a \\" // not a comment { ";\n')
+    assert result.comment_count == 0
+    assert result.braces == []
+
+
+def test_lexer_nesting_depth():
+    result = Lexer(LexerSpec()).scan('a { b { c { } } } d { }')
+    assert result.max_depth == 3
+    assert result.open_brace_lines() == [1]
+
+
+def test_java_comment_count_multiline_block():
+    source = '''
+/*
+ * Block comment over several lines // with a slash
+ */
+public class Test {
+    char quote = '"';
+    String s = "/* not a comment */";
+}
+'''
+    analyser = JavaAnalyser()
+    ast = analyser.parse(source)
+    assert analyser.count_comments(ast, source) == 1
+
+
+def test_java_unterminated_text_block_is_linear():
+    # used to backtrack exponentially in the number of backslashes:
+    source = 'class Test {\n    String s = """' + '\\\\' * 40 + '\n}\n'
+    analyser = JavaAnalyser()
+    start = time.perf_counter()
+    report = analyser.check_brace_style(source, BraceConfig('K&R'))
+    assert time.perf_counter() - start < 1
+    assert report.violations == []
+
+
+def test_java_brace_in_string_is_ignored():
+    source = '''
+public class Test {
+    String s = "{";
+}
+'''
+    analyser = JavaAnalyser()
+    report = analyser.check_brace_style(source, BraceConfig('K&R'))
+    assert report.violations == []
+    report = analyser.check_brace_style(source, BraceConfig('Allman'))
+    assert [lineno for lineno, _ in report.violations] == [2]
+
+
+def test_c_analyser():
+    source = '''
+#include <stdio.h>
+
+// entry point
+int main(void)
+{
+    printf("{ %d }\\n", 1); /* print */
+    return 0;
+}
+'''
+    analyser = CAnalyser()
+    ast = analyser.parse(source)
+    assert analyser.count_comments(ast, source) == 2
+    assert analyser.get_identifiers(ast).functions == set()
+    report = analyser.check_brace_style(source, BraceConfig('K&R'))
+    assert [lineno for lineno, _ in report.violations] == [6]
+
+
+def test_cpp_raw_string():
+    source = '''
+auto s = R"json({ "a": "// not a comment" })json";
+int f() { return 0; } // comment
+'''
+    analyser = CppAnalyser()
+    ast = analyser.parse(source)
+    assert analyser.count_comments(ast, source) == 1
+    report = analyser.check_brace_style(source, BraceConfig('Allman'))
+    assert [lineno for lineno, _ in report.violations] == [3]
+
+
+def test_javascript_template_literal():
+    source = '''
+const s = `multi
+line { // not a comment
+`;
+function f() { /* comment */ }
+'''
+    analyser = JavaScriptAnalyser()
+    ast = analyser.parse(source)
+    assert analyser.count_comments(ast, source) == 1
+    report = analyser.check_brace_style(source, BraceConfig('Allman'))
+    assert [lineno for lineno, _ in report.violations] == [5]
+
+
+def test_javascript_regex_literal():
+    source = '''
+const clean = s.replace(/[/*]/g, "");  // strip
+const half = total / 2 / count;
+function f() {
+    return /\\/*{/.test(s);
+}
+'''
+    analyser = JavaScriptAnalyser()
+    ast = analyser.parse(source)
+    assert analyser.count_comments(ast, source) == 1
+    report = analyser.check_brace_style(source, BraceConfig('Allman'))
+    assert [lineno for lineno, _ in report.violations] == [4]
+
+
+def test_javascript_division_is_not_a_regex_literal():
+    source = '''
+const r = a.in / 2; const s = "{"; // property named like a keyword
+const t = { n: 1 } / 2; // after a closing brace
+'''
+    analyser = JavaScriptAnalyser()
+    ast = analyser.parse(source)
+    assert analyser.count_comments(ast, source) == 2
+
+
+def test_csharp_verbatim_string():
+    source = '''
+class Test
+{
+    string path = @"C:\\dir\\"" // still in the string {";
+    // comment
+}
+'''
+    analyser = CSharpAnalyser()
+    ast = analyser.parse(source)
+    assert analyser.count_comments(ast, source) == 1
+    report = analyser.check_brace_style(source, BraceConfig('Allman'))
+    assert report.violations == []
+
+
+def test_engine_dispatches_brace_family(tmp_path: Path):
+    file = tmp_path / 'code.js'
+    file.write_text('function f() {\n    // comment\n}\n')
+    result = AnalyserEngine().analyse_file(file, BraceConfig('K&R'))
+    assert result.comment_count == 1
+    assert result.brace_report.violations == []
+    assert result.unused_report.unused_functions == []
@@ -0,0 +1,64 @@
+from pathlib import Path
+from code_analyser.core.budget import AnalysisBudget
+from code_analyser.core.engine import AnalyserEngine
+from code_analyser.utils.brace import BraceConfig
+
+
+def write_files(tmp_path: Path, count: int) -> list:
+    paths = []
+    for i in range(count):
+        file = tmp_path / f'mod{i}.py'
+        file.write_text(f'def unused_{i}():\n    pass\n')
+        paths.append(file)
+    return paths
+
+
+def test_budget_stops_when_exceeded(tmp_path: Path):
+    paths = write_files(tmp_path, 10)
+    analysed = []
+
+    def tracked():
+        for path in paths:
+            analysed.append(path)
+            yield path
+
+    report = AnalyserEngine().analyse_files(tracked(), budget=AnalysisBudget(max_unused=2))
+    assert report.budget_exceeded == 'Unused symbols exceed budget: 3 > 2'
+    assert report.file_count == 3
+    assert len(analysed) == 3
+
+
+def test_budget_not_exceeded(tmp_path: Path):
+    paths = write_files(tmp_path, 3)
+    report = AnalyserEngine().analyse_files(paths, budget=AnalysisBudget(max_unused=3, max_brace_violations=0))
+    assert report.budget_exceeded is None
+    assert report.file_count == 3
+
+
+def test_budget_brace_violations(tmp_path: Path):
+    java = tmp_path / 'Main.java'
+    java.write_text('public class Main\n{\n}\n')
+    paths = write_files(tmp_path, 2) + [java]
+    report = AnalyserEngine().analyse_files(paths, BraceConfig('K&R'), budget=AnalysisBudget(max_brace_violations=0))
+    assert report.budget_exceeded.startswith('Brace violations exceed budget')
+
+
+def test_budget_must_pass_files_run_first(tmp_path: Path):
+    paths = write_files(tmp_path, 5)
+    clean = tmp_path / 'clean.py'
+    clean.write_text('x = 1\nprint(x)\n')
+    broken = tmp_path / 'broken.py'
+    broken.write_text('def (:\n')
+
+    report = AnalyserEngine().analyse_files(paths + [clean], budget=AnalysisBudget(must_pass=[paths[3], clean]))
+    assert list(report.results) == [str(paths[3])]
+    assert report.budget_exceeded.startswith(f'Must-pass file {paths[3]}')
+
+    report = AnalyserEngine().analyse_files(paths, budget=AnalysisBudget(must_pass=[clean, broken]))
+    assert list(report.results) == [str(clean)]
+    assert 'could not be analysed' in report.budget_exceeded
+
+    report = AnalyserEngine().analyse_files(paths + [clean], budget=AnalysisBudget(must_pass=[clean]))
+    assert report.budget_exceeded is None
+    assert list(report.results)[0] == str(clean)
+    assert report.file_count == 6
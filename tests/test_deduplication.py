@@ -0,0 +1,75 @@
+from pathlib import Path
+from code_analyser.core.engine import AnalyserEngine
+from code_analyser.core.profiling import OutlierTracker
+
+
+JAVA_SOURCE = '''
+public class Vendored {
+    // comment
+    public void unused() {
+    }
+}
+'''
+
+
+class CountingEngine(AnalyserEngine):
+    def __init__(self) -> None:
+        super().__init__()
+        self.analysed = []
+
+    def _analyse_read_source(self, path_str, *args, **kwargs):
+        self.analysed.append(Path(path_str).name)
+        return super()._analyse_read_source(path_str, *args, **kwargs)
+
+
+def test_duplicates_analysed_once(tmp_path: Path):
+    for i in range(3):
+        (tmp_path / f'copy{i}').mkdir()
+        (tmp_path / f'copy{i}' / 'Vendored.java').write_text(JAVA_SOURCE)
+    (tmp_path / 'Other.java').write_text(JAVA_SOURCE.replace('Vendored', 'Other'))
+
+    engine = CountingEngine()
+    report = engine.analyse_directory(tmp_path, deduplicate=True)
+    assert sorted(engine.analysed) == ['Other.java', 'Vendored.java']
+    assert report.file_count == 4
+    assert report.unused_function_count == 4
+    results = [report.results[str(tmp_path / f'copy{i}' / 'Vendored.java')] for i in range(3)]
+    assert results[0] is results[1] is results[2]
+    assert results[0] == AnalyserEngine().analyse_file(tmp_path / 'copy0' / 'Vendored.java')
+
+
+def test_duplicate_errors_are_reported_per_path(tmp_path: Path):
+    for name in ('a.py', 'b.py'):
+        (tmp_path / name).write_text('def (:\n')
+    engine = CountingEngine()
+    report = engine.analyse_files([tmp_path / 'a.py', tmp_path / 'b.py'], deduplicate=True)
+    assert engine.analysed == ['a.py']
+    assert set(report.errors) == {str(tmp_path / 'a.py'), str(tmp_path / 'b.py')}
+
+
+def test_same_content_different_language_analysed_separately(tmp_path: Path):
+    (tmp_path / 'a.c').write_text('int f() { return 0; } // c\n')
+    (tmp_path / 'a.cpp').write_text('int f() { return 0; } // c\n')
+    engine = CountingEngine()
+    engine.analyse_files([tmp_path / 'a.c', tmp_path / 'a.cpp'], deduplicate=True)
+    assert engine.analysed == ['a.c', 'a.cpp']
+
+
+def test_deduplicated_matches_text_mode_newlines(tmp_path: Path):
+    (tmp_path / 'crlf.py').write_bytes(b'x = 1\r\n# comment\r\ny = x\r\n')
+    tracker = OutlierTracker(keep_all=True)
+    deduplicated = AnalyserEngine().analyse_files([tmp_path / 'crlf.py'], deduplicate=True, tracker=tracker)
+    plain = AnalyserEngine().analyse_files([tmp_path / 'crlf.py'])
+    assert deduplicated.results == plain.results
+    assert tracker.profiles[str(tmp_path / 'crlf.py')].lines == 3
+
+
+def test_duplicates_get_per_path_profiles(tmp_path: Path):
+    for name in ('a.py', 'b.py'):
+        (tmp_path / name).write_text('# comment\nx = 1\n')
+    tracker = OutlierTracker(keep_all=True)
+    AnalyserEngine().analyse_files([tmp_path / 'a.py', tmp_path / 'b.py'], deduplicate=True, tracker=tracker)
+    first, copy = tracker.profiles[str(tmp_path / 'a.py')], tracker.profiles[str(tmp_path / 'b.py')]
+    assert copy.path == str(tmp_path / 'b.py')
+    assert (copy.size, copy.lines, copy.timings) == (first.size, first.lines, first.timings)
+    assert [profile.path for profile in tracker.report().largest] == [first.path]
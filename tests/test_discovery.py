@@ -0,0 +1,65 @@
+from pathlib import Path
+from code_analyser.core.discovery import discover_sources, parse_gitignore
+from code_analyser.core.engine import AnalyserEngine
+
+
+def make_tree(root: Path, files: list) -> None:
+    for name in files:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('x = 1\n')
+
+
+def relative(root: Path, paths) -> list:
+    return [Path(p).relative_to(root).as_posix() for p in paths]
+
+
+def test_discover_filters_extensions_and_excluded_dirs(tmp_path: Path):
+    make_tree(tmp_path, [
+        'a.py', 'b.txt', 'src/Main.java', 'src/app.js', 'src/lib/util.c',
+        'node_modules/pkg/index.js', 'build/gen.py', '.venv/lib/site.py', 'nested/target/Gen.java',
+    ])
+    found = relative(tmp_path, discover_sources(tmp_path))
+    assert found == ['a.py', 'src/Main.java', 'src/app.js', 'src/lib/util.c']
+
+    found = relative(tmp_path, discover_sources(tmp_path, extensions={'.py'}, exclude_dirs={'.venv'}))
+    assert found == ['a.py', 'build/gen.py']
+
+
+def test_discover_honours_gitignore(tmp_path: Path):
+    make_tree(tmp_path, [
+        'keep.py', 'generated_pb2.py', 'logs/run.py', 'docs/conf.py', 'sub/deep/gen/x.py',
+        'sub/keep.py', 'sub/skip.py', 'sub/important_pb2.py', 'vendor/lib.py',
+    ])
+    (tmp_path / '.gitignore').write_text('# comment\n*_pb2.py\nlogs/\n/docs\n**/gen/\n')
+    (tmp_path / 'sub' / '.gitignore').write_text('skip.py\n!important_pb2.py\n')
+    (tmp_path / 'vendor' / '.gitignore').write_text('*\n')
+    found = relative(tmp_path, discover_sources(tmp_path))
+    assert found == ['keep.py', 'sub/important_pb2.py', 'sub/keep.py']
+
+    found = relative(tmp_path, discover_sources(tmp_path, use_gitignore=False))
+    assert 'logs/run.py' in found and 'vendor/lib.py' in found
+
+
+def test_parse_gitignore_rules():
+    rules = parse_gitignore('a/*.py\n!a/keep.py\nbuild/\n\\#literal\n')
+    assert [(r.negated, r.dir_only, r.anchored) for r in rules] == [
+        (False, False, True), (True, False, True), (False, True, False), (False, False, False),
+    ]
+    assert rules[0].matches('a/x.py', 'x.py', False)
+    assert not rules[0].matches('a/b/x.py', 'x.py', False)
+    assert not rules[2].matches('build', 'build', False)
+    assert rules[3].matches('#literal', '#literal', False)
+
+
+def test_discover_is_lazy(tmp_path: Path):
+    make_tree(tmp_path, ['a.py', 'b/c.py'])
+    walker = discover_sources(tmp_path)
+    assert Path(next(walker)).name == 'a.py'
+
+
+def test_engine_analyse_directory(tmp_path: Path):
+    make_tree(tmp_path, ['a.py', 'node_modules/x.js', 'ignored/b.py'])
+    (tmp_path / '.gitignore').write_text('ignored/\n')
+    report = AnalyserEngine().analyse_directory(tmp_path)
+    assert relative(tmp_path, report.results) == ['a.py']
@@ -0,0 +1,99 @@
+from pathlib import Path
+import pytest
+from code_analyser.core.engine import AnalyserEngine
+from code_analyser.languages.python import PythonAnalyser
+
+
+SOURCE = '''"""Module docstring"""
+import os
+
+# leading comment
+def main():
+    x = 1
+    y = 2
+    z = 3 # unused
+    a,b = 1,2
+    return x + y
+
+"""multiline comment (not docstring)"""
+
+@decorator
+class Foo:
+    """Class docstring"""
+    value = 42
+    def method(self):
+        "not a docstring" if True else None
+        x = 5
+        return helper()
+
+def helper():
+    x = 7; y = 8
+    return y
+
+first = 1; second = 2
+# trailing comment
+'''
+
+
+def full_result(source: str):
+    analyser = PythonAnalyser()
+    ast_node = analyser.parse(source)
+    return (
+        analyser.get_identifiers(ast_node),
+        analyser.count_comments(ast_node, source),
+        analyser.find_unused(ast_node),
+    )
+
+
+def assert_matches_full(result, source: str):
+    identifiers, comment_count, unused = full_result(source)
+    assert result.identifiers == identifiers
+    assert result.comment_count == comment_count
+    assert result.unused_report == unused
+
+
+def test_incremental_matches_full_analysis():
+    engine = AnalyserEngine()
+    result = engine.analyse_incremental('buffer.py', SOURCE)
+    assert_matches_full(result.result, SOURCE)
+    assert result.reanalysed == len(result.segments)
+
+
+@pytest.mark.parametrize('old, new', [
+    ('        x = 5\n', '        x = 5\n        # new comment\n        unused_local = 1\n'),
+    ('def helper():\n', 'def renamed():\n'),
+    ('    return x + y\n', '    return x + y + z\n'),
+    ('"""multiline comment (not docstring)"""\n', ''),
+    ('# leading comment\n', '# leading comment\n\n\n\n'),
+    ('"""Module docstring"""\n', ''),
+])
+def test_incremental_edit_reuses_unchanged_definitions(old, new):
+    engine = AnalyserEngine()
+    previous = engine.analyse_incremental('buffer.py', SOURCE)
+    edited = SOURCE.replace(old, new, 1)
+    result = engine.analyse_incremental('buffer.py', edited, previous)
+    assert_matches_full(result.result, edited)
+    assert result.reanalysed <= 1
+
+
+def test_incremental_unchanged_source_reuses_everything():
+    engine = AnalyserEngine()
+    previous = engine.analyse_incremental('buffer.py', SOURCE)
+    result = engine.analyse_incremental('buffer.py', SOURCE, previous)
+    assert result.reanalysed == 0
+    assert result.result == previous.result
+
+
+def test_incremental_matches_full_on_repo_sources():
+    engine = AnalyserEngine()
+    root = Path(__file__).resolve().parent.parent
+    for path in sorted(root.glob('**/*.py')):
+        source = path.read_text(encoding='utf-8')
+        assert_matches_full(engine.analyse_incremental(path, source).result, source)
+
+
+def test_incremental_falls_back_for_other_languages():
+    engine = AnalyserEngine()
+    result = engine.analyse_incremental('Main.js', 'function f() {} // comment\n')
+    assert result.result.comment_count == 1
+    assert result.segments == {}
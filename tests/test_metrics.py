@@ -0,0 +1,91 @@
+from pathlib import Path
+import pytest
+from code_analyser.core.engine import AnalyserEngine
+from code_analyser.core.profiling import OutlierTracker
+
+np = pytest.importorskip('numpy')
+from code_analyser.core.metrics import COLUMNS, MetricsTable  # noqa: E402
+
+
+def build_table(tmp_path: Path) -> MetricsTable:
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    (tmp_path / 'a' / 'one.py').write_text('# c1\n# c2\nx = 1\ny = x\n')
+    (tmp_path / 'a' / 'two.py').write_text('def f():\n    pass\n')
+    (tmp_path / 'b' / 'Main.java').write_text('// c\npublic class Main {\n    int unused = 0;\n}\n')
+    (tmp_path / 'b' / 'broken.py').write_text('def (:\n')
+    tracker = OutlierTracker(keep_all=True)
+    report = AnalyserEngine().analyse_files(sorted(tmp_path.glob('*/*')), tracker=tracker)
+    return MetricsTable.from_report(report, tracker.profiles)
+
+
+def test_metrics_table_columns(tmp_path: Path):
+    table = build_table(tmp_path)
+    assert len(table) == 3
+    assert set(table.columns) == set(COLUMNS)
+    rows = {Path(p).name: i for i, p in enumerate(table.paths)}
+    one, two, java = rows['one.py'], rows['two.py'], rows['Main.java']
+    assert table['comments'][one] == 2
+    assert table['lines'][one] == 4
+    assert table['unused_functions'][two] == 1
+    assert table['unused_variables'][java] == 1
+    assert table.languages[table['language'][java]] == 'java'
+    assert table['directory'][one] == table['directory'][two] != table['directory'][java]
+    assert (table['time_parse'] >= 0).all()
+
+
+def test_metrics_statistics(tmp_path: Path):
+    table = build_table(tmp_path)
+    density = table.comment_density()
+    rows = {Path(p).name: i for i, p in enumerate(table.paths)}
+    assert density[rows['one.py']] == pytest.approx(0.5)
+    assert table.percentiles(density, [0, 100]).tolist() == pytest.approx([0.0, 0.5])
+
+    comments = table.group_by_directory('comments')
+    assert comments[str(tmp_path / 'a')] == 2
+    assert comments[str(tmp_path / 'b')] == 1
+    assert table.group_by_directory('lines', how='mean')[str(tmp_path / 'a')] == 3
+    assert table.group_by_directory('comments', how='count')[str(tmp_path / 'a')] == 2
+
+    counts, edges = table.histogram('comments', bins=[0, 1, 2, 3])
+    assert counts.tolist() == [1, 1, 1]
+
+
+def test_metrics_without_profiles_has_sizes_but_no_timings(tmp_path: Path):
+    (tmp_path / 'one.py').write_text('# c\nx = 1\n')
+    report = AnalyserEngine().analyse_files([tmp_path / 'one.py'])
+    table = MetricsTable.from_report(report)
+    assert table['lines'].tolist() == [2]
+    assert table['bytes'].tolist() == [10]
+    assert np.isnan(table['time_parse']).all()
+    assert table.comment_density().tolist() == [0.5]
+
+
+def test_metrics_from_parallel_run(tmp_path: Path):
+    for i in range(4):
+        (tmp_path / f'm{i}.py').write_text('# c\n' * i + 'x = 1\n')
+    paths = sorted(tmp_path.glob('*.py'))
+    serial = MetricsTable.from_report(AnalyserEngine().analyse_files(paths))
+    parallel = MetricsTable.from_report(AnalyserEngine().analyse_files(paths, workers=2, batch_size=1))
+    order = np.argsort(parallel.paths)
+    np.testing.assert_array_equal(parallel['lines'][order], serial['lines'])
+    np.testing.assert_array_equal(parallel.comment_density()[order], serial.comment_density())
+    assert not np.isnan(serial.comment_density()).any()
+
+
+def test_metrics_save_and_load(tmp_path: Path):
+    table = build_table(tmp_path)
+    table.save(tmp_path / 'metrics.npz')
+    loaded = MetricsTable.load(tmp_path / 'metrics.npz')
+    assert loaded.paths == table.paths
+    assert loaded.path(1) == table.paths[1]
+    assert loaded.directories.tolist() == table.directories.tolist()
+    for column in COLUMNS:
+        np.testing.assert_array_equal(loaded[column], table[column])
+
+
+def test_metrics_save_and_load_without_suffix(tmp_path: Path):
+    table = build_table(tmp_path)
+    table.save(tmp_path / 'metrics')
+    assert (tmp_path / 'metrics.npz').exists()
+    assert MetricsTable.load(tmp_path / 'metrics').paths == table.paths
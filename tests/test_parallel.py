@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+import time
+from pathlib import Path
+import pytest
+from code_analyser.core.budget import AnalysisBudget
+from code_analyser.core.engine import AnalyserEngine
+from code_analyser.utils.brace import BraceConfig
+
+
+def make_corpus(tmp_path: Path, count: int = 20) -> list:
+    paths = []
+    for i in range(count):
+        file = tmp_path / f'mod{i}.py'
+        file.write_text(f'def unused_{i}():\n    x = 1  # comment\n    return 2\n')
+        paths.append(file)
+    java = tmp_path / 'Main.java'
+    java.write_text('public class Main\n{\n    int unused = 0;\n}\n')
+    broken = tmp_path / 'broken.py'
+    broken.write_text('def (:\n')
+    return paths + [java, broken]
+
+
+def test_workers_match_serial(tmp_path: Path):
+    paths = make_corpus(tmp_path)
+    engine = AnalyserEngine()
+    serial = engine.analyse_files(paths, BraceConfig('K&R'))
+    parallel = engine.analyse_files(paths, BraceConfig('K&R'), workers=2, batch_size=3)
+    assert parallel.results == serial.results
+    assert parallel.errors == serial.errors
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='Windows paths are always valid unicode')
+def test_workers_with_undecodable_path(tmp_path: Path):
+    try:
+        (tmp_path.joinpath(os.fsdecode(b'\xff.py'))).write_text('x = 1\n')
+    except (OSError, UnicodeEncodeError):
+        pytest.skip('File system does not accept undecodable names')
+    (tmp_path / 'ok.py').write_text('y = 2\n')
+    serial = AnalyserEngine().analyse_directory(tmp_path)
+    parallel = AnalyserEngine().analyse_directory(tmp_path, workers=2)
+    assert parallel.file_count == serial.file_count == 2
+    assert parallel.results == serial.results
+
+
+def test_workers_with_deduplication(tmp_path: Path):
+    paths = make_corpus(tmp_path, 4)
+    for i in range(4):
+        copy = tmp_path / f'copy{i}.py'
+        copy.write_text(paths[0].read_text())
+        paths.append(copy)
+    report = AnalyserEngine().analyse_files(paths, workers=2, batch_size=2, deduplicate=True)
+    assert report.file_count == len(paths) - 1
+    assert report.results[str(tmp_path / 'copy3.py')] == report.results[str(paths[0])]
+
+
+def test_workers_deduplicate_across_batches(tmp_path: Path):
+    for i in range(6):
+        (tmp_path / f'same{i}.py').write_text('def f():\n    x = 1\n')
+        (tmp_path / f'broken{i}.py').write_text('def (:\n')
+    paths = sorted(tmp_path.glob('*.py')) + [tmp_path / 'missing.py']
+    serial = AnalyserEngine().analyse_files(paths)
+    for workers in (1, 2):
+        report = AnalyserEngine().analyse_files(paths, workers=workers, batch_size=2, deduplicate=True)
+        assert report.results == serial.results
+        assert set(report.errors) == set(serial.errors)
+
+
+def test_workers_with_budget(tmp_path: Path):
+    report = AnalyserEngine().analyse_files(make_corpus(tmp_path), workers=2, batch_size=2, budget=AnalysisBudget(max_unused=1))
+    assert report.budget_exceeded is not None
+    assert report.file_count == 1
+
+
+def test_workers_stop_running_batches_on_budget_stop(tmp_path: Path):
+    # each file takes tens of milliseconds, so the four outstanding batches hold seconds of work:
+    source = ''.join(f'def f{i}(a):\n    x = a + {i}\n    return x\n' for i in range(400))
+    paths = []
+    for i in range(60):
+        paths.append(tmp_path / f'mod{i}.py')
+        paths[-1].write_text(source)
+    report = AnalyserEngine().analyse_files(paths, workers=2, batch_size=10, budget=AnalysisBudget(max_unused=0))
+    assert report.file_count == 1
+    start = time.perf_counter()
+    for child in multiprocessing.active_children():
+        child.join(timeout=10)
+    assert time.perf_counter() - start < 1
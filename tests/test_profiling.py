@@ -0,0 +1,88 @@
+import os
+import pstats
+from pathlib import Path
+from code_analyser.core.engine import AnalyserEngine
+from code_analyser.core.profiling import PHASES, FileProfile, OutlierTracker
+from code_analyser.languages.java import JavaAnalyser
+from code_analyser.languages.python import PythonAnalyser
+from code_analyser.utils.brace import BraceConfig
+
+
+def write_files(tmp_path: Path) -> list:
+    paths = []
+    for i in range(5):
+        file = tmp_path / f'mod{i}.py'
+        # each file is larger and more deeply nested than the previous one:
+        body = ''.join(f'{"    " * (d + 1)}if x:\n' for d in range(i)) + f'{"    " * (i + 1)}pass\n'
+        file.write_text('def f(x):\n' + body + '# padding\n' * (i * 10))
+        paths.append(file)
+    return paths
+
+
+def test_tracker_keeps_top_n():
+    tracker = OutlierTracker(top_n=2)
+    for i in range(5):
+        tracker.record(FileProfile(f'f{i}', size=i * 100, lines=i, timings={'parse': 5 - i}))
+    report = tracker.report()
+    assert [p.path for p in report.slowest] == ['f0', 'f1']
+    assert [p.path for p in report.largest] == ['f4', 'f3']
+
+
+def test_engine_records_profiles(tmp_path: Path):
+    paths = write_files(tmp_path)
+    tracker = OutlierTracker(top_n=3)
+    AnalyserEngine().analyse_files(paths, tracker=tracker)
+    report = tracker.report()
+
+    assert len(report.slowest) == 3
+    largest = report.largest[0]
+    assert largest.path == str(paths[-1])
+    assert largest.size == paths[-1].stat().st_size
+    assert largest.lines == 46
+    assert set(largest.timings) == set(PHASES)
+    assert largest.node_count > report.largest[-1].node_count
+    assert largest.max_depth > report.largest[-1].max_depth
+    assert 'Slowest files:' in report.format()
+
+
+def test_engine_dumps_profile_over_threshold(tmp_path: Path):
+    paths = write_files(tmp_path)
+    profile_dir = tmp_path / 'profiles'
+    tracker = OutlierTracker(top_n=5, profile_threshold=0.0, profile_dir=profile_dir)
+    AnalyserEngine().analyse_files(paths[:2], tracker=tracker)
+    dumps = [p.profile_path for p in tracker.report().slowest]
+    assert all(dumps)
+    assert sorted(Path(d).name for d in dumps) == sorted(p.name for p in profile_dir.iterdir())
+    pstats.Stats(dumps[0])
+
+
+def test_ast_stats():
+    node_count, max_depth = PythonAnalyser().ast_stats(PythonAnalyser().parse('x = 1\n'))
+    # Module -> Assign -> Name -> Store
+    assert (node_count, max_depth) == (5, 4)
+
+    analyser = JavaAnalyser()
+    node_count, max_depth = analyser.ast_stats(analyser.parse('class A { void f() { int x = 1; } }'))
+    assert node_count > 4
+    assert max_depth >= 4
+
+
+def test_profile_path_for_undecodable_path(tmp_path: Path):
+    tracker = OutlierTracker(profile_threshold=0.0, profile_dir=tmp_path)
+    path = tracker.profile_path_for(os.fsdecode(b'/src/\xff.py'))
+    assert os.path.dirname(path) == str(tmp_path)
+
+
+def test_engine_times_lexing_separately(tmp_path: Path):
+    file = tmp_path / 'Main.java'
+    file.write_text('public class Main {\n' + '    // comment\n    int x = 0;\n' * 2000 + '}\n')
+    tracker = OutlierTracker(keep_all=True)
+    AnalyserEngine().analyse_file(file, BraceConfig('K&R'), tracker)
+    timings = tracker.profiles[str(file)].timings
+    # comments reuse the scan, so lexing is not charged to them:
+    assert timings['lex'] > timings['comments']
+
+    python_file = tmp_path / 'code.py'
+    python_file.write_text('x = 1\n')
+    AnalyserEngine().analyse_file(python_file, tracker=tracker)
+    assert tracker.profiles[str(python_file)].timings['lex'] == 0.0
@@ -0,0 +1,78 @@
+import io
+import json
+from pathlib import Path
+import pytest
+from code_analyser.core.engine import AnalyserEngine
+from code_analyser.core.sarif import SarifWriter, write_sarif
+from code_analyser.utils.brace import BraceConfig
+
+
+def test_write_sarif_findings(tmp_path: Path):
+    (tmp_path / 'code.py').write_text('def foo():\n    x = 1\n    y = 2\n    return x\n')
+    (tmp_path / 'Main.java').write_text('public class Main\n{\n}\n')
+    (tmp_path / 'broken.py').write_text('def (:\n')
+    stream = io.StringIO()
+    count = write_sarif(sorted(tmp_path.iterdir()), stream, BraceConfig('K&R'), root=tmp_path)
+
+    sarif = json.loads(stream.getvalue())
+    assert sarif['version'] == '2.1.0'
+    run = sarif['runs'][0]
+    findings = {(r['ruleId'], r['locations'][0]['physicalLocation']['artifactLocation']['uri'], r['locations'][0]['physicalLocation']['region']['startLine']) for r in run['results']}
+    assert count == len(run['results']) == 3
+    assert findings == {
+        ('unused-function', 'code.py', 1),
+        ('unused-variable', 'code.py', 3),
+        ('brace-style', 'Main.java', 2),
+    }
+    for r in run['results']:
+        assert run['tool']['driver']['rules'][r['ruleIndex']]['id'] == r['ruleId']
+        assert r['locations'][0]['physicalLocation']['artifactLocation']['uriBaseId'] == '%SRCROOT%'
+
+    invocation = run['invocations'][0]
+    assert invocation['executionSuccessful'] is False
+    assert len(invocation['toolExecutionNotifications']) == 1
+
+
+def test_sarif_writer_streams_before_close(tmp_path: Path):
+    (tmp_path / 'code.py').write_text('def foo():\n    pass\n')
+    result = AnalyserEngine().analyse_file(tmp_path / 'code.py')
+    stream = io.StringIO()
+    writer = SarifWriter(stream)
+    writer.add_result('code.py', result)
+    assert "Function 'foo'" in stream.getvalue()
+    writer.close()
+    writer.close()
+    sarif = json.loads(stream.getvalue())
+    assert sarif['runs'][0]['invocations'][0]['executionSuccessful'] is True
+
+
+def test_sarif_empty_run():
+    stream = io.StringIO()
+    with SarifWriter(stream):
+        pass
+    assert json.loads(stream.getvalue())['runs'][0]['results'] == []
+
+
+def test_sarif_uris_are_percent_encoded(tmp_path: Path):
+    (tmp_path / 'my dir').mkdir()
+    (tmp_path / 'my dir' / 'code #1%.py').write_text('def foo():\n    pass\n')
+    result = AnalyserEngine().analyse_file(tmp_path / 'my dir' / 'code #1%.py')
+    stream = io.StringIO()
+    with SarifWriter(stream, root=tmp_path) as writer:
+        writer.add_result(tmp_path / 'my dir' / 'code #1%.py', result)
+        writer.add_result('my dir/code #1%.py', result)
+    uris = [r['locations'][0]['physicalLocation']['artifactLocation']['uri'] for r in json.loads(stream.getvalue())['runs'][0]['results']]
+    assert uris == ['my%20dir/code%20%231%25.py'] * 2
+
+
+def test_sarif_interrupted_run_is_not_successful(tmp_path: Path):
+    (tmp_path / 'code.py').write_text('def foo():\n    pass\n')
+    result = AnalyserEngine().analyse_file(tmp_path / 'code.py')
+    stream = io.StringIO()
+    with pytest.raises(KeyboardInterrupt):
+        with SarifWriter(stream) as writer:
+            writer.add_result('code.py', result)
+            raise KeyboardInterrupt
+    invocation = json.loads(stream.getvalue())['runs'][0]['invocations'][0]
+    assert invocation['executionSuccessful'] is False
+    assert invocation['toolExecutionNotifications'][0]['exception']['kind'] == 'KeyboardInterrupt'
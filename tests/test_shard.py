@@ -0,0 +1,163 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from code_analyser.core.engine import AnalyserEngine
+from code_analyser.core.shard import ShardManifest, build_manifest, main, merge_shards, run_shard, shard_of
+from code_analyser.utils.brace import BraceConfig
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_corpus(root: Path) -> list:
+    paths = []
+    for i in range(12):
+        file = root / f'pkg{i % 3}' / f'mod{i}.py'
+        file.parent.mkdir(exist_ok=True)
+        file.write_text(f'''
+def used_{i}():
+    return 1
+
+def unused_{i}():
+    x = used_{i}()  # comment
+    y = 2
+    return x
+''')
+        paths.append(file)
+    java = root / 'Main.java'
+    java.write_text('''
+public class Main
+{
+    // comment
+    public static void main(String[] args) {
+        int unused = 1;
+    }
+}
+''')
+    paths.append(java)
+    broken = root / 'broken.py'
+    broken.write_text('def (:\n')
+    paths.append(broken)
+    return paths
+
+
+def test_shard_of_is_deterministic():
+    assert shard_of('a/b.py', 7) == shard_of(Path('a') / 'b.py', 7)
+    assert {shard_of(f'file{i}.py', 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+def test_build_manifest_partitions_paths(tmp_path: Path):
+    paths = make_corpus(tmp_path)
+    manifest = build_manifest(paths, 4, tmp_path)
+    flattened = [p for shard in manifest.shards for p in shard]
+    assert sorted(flattened) == sorted(p.relative_to(tmp_path).as_posix() for p in paths)
+    for index, shard in enumerate(manifest.shards):
+        assert all(shard_of(p, 4) == index for p in shard)
+
+
+def test_sharded_processes_match_single_run(tmp_path: Path):
+    corpus = tmp_path / 'corpus'
+    corpus.mkdir()
+    paths = make_corpus(corpus)
+    manifest_path = tmp_path / 'manifest.json'
+    build_manifest(paths, 3, corpus, BraceConfig('K&R')).save(manifest_path)
+
+    outputs = [tmp_path / f'shard-{i}.json' for i in range(3)]
+    processes = [
+        subprocess.Popen([sys.executable, '-m', 'code_analyser.core.shard', 'run', str(manifest_path), str(i), str(output)], cwd=REPO_ROOT)
+        for i, output in enumerate(outputs)
+    ]
+    assert all(p.wait() == 0 for p in processes)
+
+    merged_path = tmp_path / 'report.json'
+    subprocess.run(
+        [sys.executable, '-m', 'code_analyser.core.shard', 'merge', str(manifest_path), str(merged_path), *map(str, outputs)],
+        check=True,
+        cwd=REPO_ROOT
+    )
+    merged = merge_shards(manifest_path, outputs)
+    single = AnalyserEngine().analyse_files(paths, BraceConfig('K&R'))
+
+    single_results = {Path(p).relative_to(corpus).as_posix(): r for p, r in single.results.items()}
+    assert merged.results == single_results
+    assert set(merged.errors) == {'broken.py'}
+    assert merged.unused_function_count == single.unused_function_count == 13
+    assert merged.unused_variable_count == single.unused_variable_count == 13
+    assert merged.brace_violation_count == single.brace_violation_count == 1
+    assert merged.comment_count == single.comment_count
+    merged_json = json.loads(merged_path.read_text())
+    assert set(merged_json['results']) == set(merged.results)
+    assert merged_json['totals'] == {
+        'files': single.file_count,
+        'errors': 1,
+        'comments': single.comment_count,
+        'unused_variables': 13,
+        'unused_functions': 13,
+        'brace_violations': 1,
+    }
+
+
+def test_merge_rejects_missing_and_foreign_shards(tmp_path: Path):
+    paths = make_corpus(tmp_path)
+    manifest_path = tmp_path / 'manifest.json'
+    build_manifest(paths, 2, tmp_path).save(manifest_path)
+    outputs = [tmp_path / f'shard-{i}.json' for i in range(2)]
+    for i, output in enumerate(outputs):
+        run_shard(manifest_path, i, output)
+
+    with pytest.raises(ValueError, match='Missing'):
+        merge_shards(manifest_path, outputs[:1])
+    with pytest.raises(ValueError, match='more than once'):
+        merge_shards(manifest_path, [outputs[0], outputs[0], outputs[1]])
+
+    other_manifest = tmp_path / 'other.json'
+    build_manifest(paths[:3], 2, tmp_path).save(other_manifest)
+    with pytest.raises(ValueError, match='different manifest'):
+        merge_shards(other_manifest, outputs)
+
+
+def test_plan_reads_files_from_list_or_discovers(tmp_path: Path):
+    corpus = tmp_path / 'corpus'
+    corpus.mkdir()
+    paths = make_corpus(corpus)
+    expected = build_manifest(paths, 3, corpus).shards
+
+    file_list = tmp_path / 'files.txt'
+    file_list.write_text(''.join(f'{p}\n' for p in paths) + '\n')
+    main(['plan', str(tmp_path / 'listed.json'), '--files-from', str(file_list), '--shards', '3', '--root', str(corpus)])
+    assert ShardManifest.load(tmp_path / 'listed.json').shards == expected
+
+    subprocess.run(
+        [sys.executable, '-m', 'code_analyser.core.shard', 'plan', str(tmp_path / 'stdin.json'), '--files-from', '-', '--shards', '3', '--root', str(corpus)],
+        input=file_list.read_text(),
+        text=True,
+        check=True,
+        cwd=REPO_ROOT
+    )
+    assert ShardManifest.load(tmp_path / 'stdin.json').shards == expected
+
+    main(['plan', str(tmp_path / 'discovered.json'), '--shards', '3', '--root', str(corpus)])
+    assert ShardManifest.load(tmp_path / 'discovered.json').shards == expected
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='Windows paths are always valid unicode')
+def test_plan_with_undecodable_path(tmp_path: Path):
+    try:
+        (tmp_path / os.fsdecode(b'\xff.py')).write_text('x = 1\n')
+    except (OSError, UnicodeEncodeError):
+        pytest.skip('File system does not accept undecodable names')
+    main(['plan', str(tmp_path / 'manifest.json'), '--shards', '2', '--root', str(tmp_path)])
+    manifest = ShardManifest.load(tmp_path / 'manifest.json')
+    assert [p for shard in manifest.shards for p in shard] == [os.fsdecode(b'\xff.py')]
+    run_shard(tmp_path / 'manifest.json', shard_of(os.fsdecode(b'\xff.py'), 2), tmp_path / 'out.json')
+
+
+def test_manifest_round_trip(tmp_path: Path):
+    manifest = ShardManifest(str(tmp_path), 2, [['a.py'], ['b.java']], 'Allman')
+    manifest.save(tmp_path / 'm.json')
+    loaded = ShardManifest.load(tmp_path / 'm.json')
+    assert loaded == manifest
+    assert loaded.digest() == manifest.digest()